@@ -4,18 +4,165 @@ Opsera Press Release Scraper - Web Frontend
 Simple Flask app to view and run the scraper
 """
 
-from flask import Flask, render_template_string, jsonify, request
-import json
+from flask import Flask, Response, render_template_string, jsonify, request, stream_with_context
+import atexit
+import gzip
+import hashlib
 import os
-import subprocess
 import threading
 from datetime import datetime
+from browser import BrowserPool
+from datalog import read_snapshot
+from events import EventBus, format_sse
+from jobs import JobManager
+from record import PressRelease, to_date
+from scraper import scraper_options_from_env
+from search import SearchIndex
+from test_scraper import TestScraper
 
 app = Flask(__name__)
 
 # Path to scraped data
 DATA_FILE = 'scraped_data.json'
-scraper_status = {'running': False, 'last_run': None, 'message': ''}
+
+# Full-text index behind /api/search; scrapes started here also write to it record by record
+SEARCH_DB = 'search.db'
+
+# /api/data paging and sorting
+DEFAULT_PER_PAGE = 25
+MAX_PER_PAGE = 200
+SORT_KEYS = {
+    'date': PressRelease.sort_key,
+    'title': lambda pr: pr.title.casefold(),
+    'category': lambda pr: pr.category.casefold(),
+}
+
+# JSON responses smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+
+# Chrome stays warm between scrapes; it is only started when a scrape needs the browser listing
+_browser_pool = None
+_browser_pool_lock = threading.Lock()
+
+# Scraper and job progress, streamed to dashboards through /api/events
+events = EventBus()
+
+
+class DataSnapshot:
+    """One parsed version of the data file, with its sorted views built on demand"""
+
+    def __init__(self, records, version, mtime):
+        self.records = records  # newest first
+        self.version = version
+        self.last_modified = datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')
+        dates = [pr.date for pr in records if pr.date]
+        self.stats = {
+            'count': len(records),
+            'latest': max(dates).isoformat() if dates else None,
+            'oldest': min(dates).isoformat() if dates else None,
+        }
+        self._views = {('date', 'desc'): records}
+        self._lock = threading.Lock()
+
+    def sorted(self, sort, order):
+        """Return the records ordered by a SORT_KEYS key, 'asc' or 'desc' (cached per ordering)"""
+        with self._lock:
+            if (sort, order) not in self._views:
+                self._views[(sort, order)] = sorted(self.records, key=SORT_KEYS[sort], reverse=order == 'desc')
+            return self._views[(sort, order)]
+
+
+class DataCache:
+    """Keep the parsed data file in memory, re-reading it only when its mtime or size changes"""
+
+    def __init__(self, path):
+        self.path = path
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        """Return the current DataSnapshot, or None when there is no data file yet"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != self._version(stat):
+                # Scrapes replace the file atomically, so this parses one complete snapshot;
+                # its version comes from the descriptor that was read, not the earlier stat
+                records, stat = read_snapshot(self.path)
+                if records is None:
+                    return None
+                records.sort(key=PressRelease.sort_key, reverse=True)
+                self._snapshot = DataSnapshot(records, self._version(stat), stat.st_mtime)
+            return self._snapshot
+
+    @staticmethod
+    def _version(stat):
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+data_cache = DataCache(DATA_FILE)
+search_index = SearchIndex(SEARCH_DB)
+atexit.register(search_index.close)
+
+
+def synced_search_index(snapshot):
+    """Return the search index, first catching it up with a data file version it has not seen"""
+    if snapshot is not None and search_index.version() != snapshot.version:
+        search_index.sync(snapshot.records, snapshot.version)
+    return search_index
+
+
+def matches_query(pr, query):
+    """Case-insensitive substring match over title, description and date (the dashboard search)"""
+    return query in pr.title.casefold() or query in pr.description.casefold() or query in pr.date_text
+
+
+def shared_browser_pool(options):
+    """Return the app-wide BrowserPool, creating it on first use"""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool(options['browser_pool_size'], options['browser_max_uses'],
+                                        profile=options['rendering_profile'])
+            atexit.register(_browser_pool.close)
+        return _browser_pool
+
+
+class JobScraper(TestScraper):
+    """Dry-run scraper that reports its progress to a background job"""
+
+    def __init__(self, job, **kwargs):
+        self.job = job
+        super().__init__(**kwargs)
+
+    def _emit(self, press_release):
+        super()._emit(press_release)
+        self.job.update(extracted=len(self.press_releases))
+
+
+def run_scrape_job(job):
+    """Run a dry-run scrape in this process, writing DATA_FILE, and return the job result"""
+    options = scraper_options_from_env()
+    options['browser_pool'] = shared_browser_pool(options)
+    options['events'] = events
+    # Index each record as it is extracted, so search sees a running scrape's results
+    options['output_sinks'] = f"{options['output_sinks']},search={SEARCH_DB}"
+    scraper = JobScraper(job, **options)
+    job.update(phase='scraping', extracted=0)
+    scraper.scrape_press_releases()
+    job.update(phase='done')
+    count = len(scraper.press_releases)
+    return {
+        'count': count,
+        'output': scraper.json_output,
+        'stats': scraper.article_stats,
+        'message': f'Successfully scraped {count} press releases!',
+    }
+
+
+scrape_jobs = JobManager(run_scrape_job, events=events)
 
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
@@ -193,6 +340,38 @@ HTML_TEMPLATE = '''
             border-radius: 20px;
             font-size: 12px;
         }
+        th.sortable {
+            cursor: pointer;
+        }
+        th.sortable:hover {
+            color: #fff;
+        }
+        .pagination {
+            padding: 15px 20px;
+            display: flex;
+            justify-content: flex-end;
+            align-items: center;
+            gap: 15px;
+            color: #9ca3af;
+            font-size: 14px;
+        }
+        .pagination .btn:disabled {
+            opacity: 0.4;
+            cursor: not-allowed;
+        }
+        .row-new {
+            animation: highlight 2s ease;
+        }
+        .new-records {
+            display: none;
+            color: #10b981;
+            cursor: pointer;
+            text-decoration: underline;
+        }
+        @keyframes highlight {
+            from { background: rgba(16, 185, 129, 0.25); }
+            to { background: transparent; }
+        }
         .empty-state {
             text-align: center;
             padding: 60px 20px;
@@ -225,6 +404,14 @@ HTML_TEMPLATE = '''
             color: white;
             width: 250px;
         }
+        .search-controls {
+            display: flex;
+            gap: 10px;
+        }
+        .date-box {
+            width: 150px;
+            color-scheme: dark;
+        }
         .search-box::placeholder {
             color: #6b7280;
         }
@@ -270,42 +457,73 @@ HTML_TEMPLATE = '''
         <div class="table-container">
             <div class="table-header">
                 <h2>Press Releases</h2>
-                <input type="text" class="search-box" placeholder="Search..." id="searchBox" onkeyup="filterTable()">
+                <div class="search-controls">
+                    <input type="date" class="search-box date-box" id="dateFrom" title="From" onchange="filterTable()">
+                    <input type="date" class="search-box date-box" id="dateTo" title="To" onchange="filterTable()">
+                    <input type="text" class="search-box" placeholder="Search..." id="searchBox" onkeyup="filterTable()">
+                </div>
             </div>
             <table id="pressTable">
                 <thead>
                     <tr>
                         <th>#</th>
-                        <th>Title</th>
-                        <th>Date</th>
-                        <th>Category</th>
+                        <th class="sortable" onclick="sortBy('title')">Title</th>
+                        <th class="sortable" onclick="sortBy('date')">Date</th>
+                        <th class="sortable" onclick="sortBy('category')">Category</th>
                         <th>Description</th>
                     </tr>
                 </thead>
                 <tbody id="tableBody">
                 </tbody>
             </table>
+            <div class="pagination">
+                <span class="new-records" id="newRecords" onclick="loadData()"></span>
+                <button class="btn btn-secondary" id="prevPage" onclick="goToPage(-1)">Previous</button>
+                <span id="pageInfo"></span>
+                <button class="btn btn-secondary" id="nextPage" onclick="goToPage(1)">Next</button>
+            </div>
         </div>
     </div>
 
     <div class="toast" id="toast"></div>
 
     <script>
-        let pressReleases = [];
+        let pressReleases = [];  // the page on screen
+        let unseenRecords = 0;  // streamed records that belong outside the page on screen
+        const view = { page: 1, perPage: 25, sort: 'date', order: 'desc', q: '', from: '', to: '' };
 
+        // Only the visible page is requested; the server filters, sorts and pages the archive
+        // and answers an unchanged page with 304 Not Modified (the browser revalidates its ETag).
+        // A search or date range goes to the ranked full-text index instead
         async function loadData() {
+            const searching = view.q || view.from || view.to;
+            const params = new URLSearchParams({ page: view.page, per_page: view.perPage });
+            if (searching) {
+                if (view.q) params.set('q', view.q);
+                if (view.from) params.set('from', view.from);
+                if (view.to) params.set('to', view.to);
+            } else {
+                params.set('sort', view.sort);
+                params.set('order', view.order);
+            }
             try {
-                const response = await fetch('/api/data');
+                const response = await fetch(`/api/${searching ? 'search' : 'data'}?${params}`);
                 const data = await response.json();
+                if (data.pages && view.page > data.pages) {
+                    view.page = data.pages;
+                    return loadData();
+                }
                 pressReleases = data.press_releases || [];
-                renderTable(pressReleases);
+                setUnseenRecords(0);
+                renderTable(pressReleases, (data.page - 1) * data.per_page);
+                renderPagination(data);
                 updateStats(data);
             } catch (error) {
                 console.error('Error loading data:', error);
             }
         }
 
-        function renderTable(data) {
+        function renderTable(data, offset = 0) {
             const tbody = document.getElementById('tableBody');
 
             if (data.length === 0) {
@@ -322,9 +540,13 @@ HTML_TEMPLATE = '''
                 return;
             }
 
-            tbody.innerHTML = data.map((pr, i) => `
-                <tr>
-                    <td>${i + 1}</td>
+            tbody.innerHTML = data.map((pr, i) => rowHtml(pr, offset + i + 1)).join('');
+        }
+
+        function rowHtml(pr, number, className = '') {
+            return `
+                <tr class="${className}">
+                    <td>${number}</td>
                     <td class="title-cell">
                         <a href="${pr.link}" target="_blank">${pr.title}</a>
                     </td>
@@ -332,31 +554,90 @@ HTML_TEMPLATE = '''
                     <td><span class="category-badge">${pr.category || 'Press Release'}</span></td>
                     <td class="desc-cell" title="${pr.description || ''}">${pr.description || '-'}</td>
                 </tr>
-            `).join('');
-        }
-
-        function updateStats(data) {
-            document.getElementById('totalCount').textContent = data.press_releases?.length || 0;
+            `;
+        }
+
+        // Add a record streamed from a running scrape without re-rendering the table. Its place
+        // is only known on the first page of the default newest-first view; anywhere else (other
+        // pages, sorts or ranked search results) it is counted and the user can refresh
+        function appendRecord(pr) {
+            if (pressReleases.some(existing => existing.link === pr.link)) return;
+            const searching = view.q || view.from || view.to;
+            if (searching && !matchesSearch(pr)) return;
+            if (searching || view.page !== 1 || view.sort !== 'date' || view.order !== 'desc') {
+                setUnseenRecords(unseenRecords + 1);
+                return;
+            }
 
-            if (data.press_releases?.length > 0) {
-                const dates = data.press_releases
-                    .map(pr => pr.date)
-                    .filter(d => d)
-                    .sort();
+            // Same order as the server: newest first, undated last, ties in arrival order
+            const newer = (a, b) => isoDate(a.date) > isoDate(b.date);
+            let index = pressReleases.findIndex(existing => newer(pr, existing));
+            if (index === -1) index = pressReleases.length;
+            if (index >= view.perPage) {
+                setUnseenRecords(unseenRecords + 1);
+                return;
+            }
+            pressReleases.splice(index, 0, pr);
 
-                if (dates.length > 0) {
-                    document.getElementById('latestDate').textContent = formatDate(dates[dates.length - 1]);
-                    document.getElementById('oldestDate').textContent = formatDate(dates[0]);
-                }
+            const tbody = document.getElementById('tableBody');
+            if (tbody.querySelector('.empty-state')) tbody.innerHTML = '';
+            const html = rowHtml(pr, index + 1, 'row-new');
+            if (index < tbody.rows.length) {
+                tbody.rows[index].insertAdjacentHTML('beforebegin', html);
+            } else {
+                tbody.insertAdjacentHTML('beforeend', html);
+            }
+            // Keep the page at its size; the row pushed off belongs to the next page
+            if (pressReleases.length > view.perPage) {
+                pressReleases.pop();
+                tbody.deleteRow(-1);
             }
+            for (let i = index + 1; i < tbody.rows.length; i++) {
+                tbody.rows[i].cells[0].textContent = i + 1;
+            }
+        }
+
+        function setUnseenRecords(count) {
+            unseenRecords = count;
+            const link = document.getElementById('newRecords');
+            link.textContent = `${count} new \u2013 refresh`;
+            link.style.display = count ? 'inline' : 'none';
+        }
+
+        function updateStats(data) {
+            const stats = data.stats || {};
+            document.getElementById('totalCount').textContent = stats.count || 0;
+            document.getElementById('latestDate').textContent = formatDate(stats.latest);
+            document.getElementById('oldestDate').textContent = formatDate(stats.oldest);
 
             if (data.last_modified) {
                 document.getElementById('lastScraped').textContent = data.last_modified;
             }
         }
 
+        function renderPagination(data) {
+            const pages = Math.max(data.pages, 1);
+            document.getElementById('pageInfo').textContent =
+                `Page ${data.page} of ${pages} (${data.total} ${data.query !== undefined ? 'matching' : 'total'})`;
+            document.getElementById('prevPage').disabled = data.page <= 1;
+            document.getElementById('nextPage').disabled = data.page >= pages;
+        }
+
+        function goToPage(delta) {
+            view.page = Math.max(1, view.page + delta);
+            loadData();
+        }
+
+        function sortBy(key) {
+            view.order = view.sort === key && view.order === 'desc' ? 'asc' : 'desc';
+            view.sort = key;
+            view.page = 1;
+            loadData();
+        }
+
         function formatDate(dateStr) {
             if (!dateStr) return '-';
+            if (!isoDate(dateStr)) return dateStr;
             try {
                 const date = new Date(dateStr);
                 return date.toLocaleDateString('en-US', {
@@ -369,36 +650,98 @@ HTML_TEMPLATE = '''
             }
         }
 
-        function filterTable() {
-            const search = document.getElementById('searchBox').value.toLowerCase();
-            const filtered = pressReleases.filter(pr =>
-                pr.title?.toLowerCase().includes(search) ||
-                pr.description?.toLowerCase().includes(search) ||
-                pr.date?.includes(search)
-            );
-            renderTable(filtered);
+        // A date the site gave in a form the scraper could not parse is shown as is but counts as undated
+        function isoDate(dateStr) {
+            return /^\\d{4}-\\d{2}-\\d{2}/.test(dateStr || '') ? dateStr : '';
         }
 
-        async function runScraper() {
-            const btn = document.getElementById('runBtn');
-            const status = document.getElementById('status');
+        // Rough client-side version of the search, used for records streamed in during a scrape
+        function matchesSearch(pr) {
+            const date = isoDate(pr.date);
+            if ((view.from || view.to) && !date) return false;
+            if (view.from && date < view.from) return false;
+            if (view.to && date > view.to) return false;
+            const text = `${pr.title} ${pr.description} ${pr.category}`.toLowerCase();
+            return view.q.toLowerCase().split(/\\s+/).every(word => text.includes(word));
+        }
 
-            btn.disabled = true;
-            btn.textContent = 'Running...';
-            status.innerHTML = '<span class="status-indicator status-running"></span>Scraping...';
+        // Search runs on the server; wait for a pause in typing instead of querying per keystroke
+        let searchTimer = null;
 
+        function filterTable() {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => {
+                const q = document.getElementById('searchBox').value.trim();
+                const from = document.getElementById('dateFrom').value;
+                const to = document.getElementById('dateTo').value;
+                if (q === view.q && from === view.from && to === view.to) return;
+                Object.assign(view, { q, from, to, page: 1 });
+                loadData();
+            }, 250);
+        }
+
+        async function runScraper() {
             try {
                 const response = await fetch('/api/scrape', { method: 'POST' });
                 const result = await response.json();
-
                 showToast(result.message);
-                await loadData();
+                handleJob(result.job);
             } catch (error) {
                 showToast('Error running scraper: ' + error.message);
-            } finally {
-                btn.disabled = false;
-                btn.textContent = 'Run Scraper';
-                status.innerHTML = '<span class="status-indicator status-ready"></span>Ready';
+            }
+        }
+
+        // Scrape progress arrives as Server-Sent Events; EventSource reconnects by itself
+        let runningJob = null;
+
+        function handleJob(job) {
+            if (job.status === 'queued' || job.status === 'running') {
+                if (runningJob !== job.id) setRunning(true, 'Scraping...');
+                runningJob = job.id;
+                return;
+            }
+            if (runningJob !== job.id) return;
+            runningJob = null;
+            setRunning(false);
+            showToast(job.status === 'succeeded' ? job.result.message : 'Scraper error: ' + job.error);
+            loadData();
+        }
+
+        function setRunning(running, detail) {
+            const btn = document.getElementById('runBtn');
+            const status = document.getElementById('status');
+            btn.disabled = running;
+            btn.textContent = running ? 'Running...' : 'Run Scraper';
+            status.innerHTML = running
+                ? `<span class="status-indicator status-running"></span>${detail}`
+                : '<span class="status-indicator status-ready"></span>Ready';
+        }
+
+        function listen() {
+            const source = new EventSource('/api/events');
+            const on = (event, handler) => source.addEventListener(event, e => handler(JSON.parse(e.data)));
+
+            on('job', handleJob);
+            on('page_scanned', data => {
+                if (runningJob) setRunning(true, `Scanning page ${data.page}... (${data.total} links)`);
+            });
+            on('link_discovered', data => {
+                if (runningJob) setRunning(true, `Discovered ${data.index} links...`);
+            });
+            on('article_extracted', data => {
+                appendRecord(data.record);
+                if (runningJob) setRunning(true, `Scraping... (${data.count} extracted)`);
+            });
+        }
+
+        // Pick up a scrape another user (or another tab) already started
+        async function resumeJob() {
+            try {
+                const response = await fetch('/api/jobs');
+                const data = await response.json();
+                if (data.current) handleJob(data.current);
+            } catch (error) {
+                console.error('Error checking scrape jobs:', error);
             }
         }
 
@@ -416,6 +759,8 @@ HTML_TEMPLATE = '''
 
         // Load data on page load
         loadData();
+        listen();
+        resumeJob();
     </script>
 </body>
 </html>
@@ -425,67 +770,161 @@ HTML_TEMPLATE = '''
 def index():
     return render_template_string(HTML_TEMPLATE)
 
+def int_arg(name, default, low, high):
+    """Read an integer query parameter clamped to [low, high]"""
+    try:
+        value = int(request.args.get(name, default))
+    except ValueError:
+        value = default
+    return max(low, min(high, value))
+
+@app.after_request
+def compress_json(response):
+    """Gzip JSON responses for clients that accept it"""
+    if (response.mimetype != 'application/json' or response.status_code != 200 or response.direct_passthrough
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()
+            or 'Content-Encoding' in response.headers):
+        return response
+    body = response.get_data()
+    if len(body) < GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
 @app.route('/api/data')
 def get_data():
-    """Return the scraped press release data"""
-    data = {'press_releases': [], 'last_modified': None}
-
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, 'r') as f:
-                data['press_releases'] = json.load(f)
+    """
+    Return one page of the scraped press releases
+
+    Query parameters: page (1-based), per_page, sort (date, title or category), order (asc or
+    desc) and q (substring filter). The parsed file is cached until it changes, and the ETag
+    lets the browser revalidate a page it already has with a 304.
+    """
+    sort = request.args.get('sort', 'date')
+    if sort not in SORT_KEYS:
+        sort = 'date'
+    order = 'asc' if request.args.get('order') == 'asc' else 'desc'
+    query = request.args.get('q', '').strip().casefold()
+    per_page = int_arg('per_page', DEFAULT_PER_PAGE, 1, MAX_PER_PAGE)
+    page = int_arg('page', 1, 1, 1_000_000)
 
-            # Get file modification time
-            mtime = os.path.getmtime(DATA_FILE)
-            data['last_modified'] = datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')
-        except Exception as e:
-            print(f"Error loading data: {e}")
+    try:
+        snapshot = data_cache.snapshot()
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        snapshot = None
+    if snapshot is None:
+        return jsonify({'press_releases': [], 'total': 0, 'page': 1, 'pages': 0, 'per_page': per_page,
+                        'last_modified': None, 'stats': {'count': 0, 'latest': None, 'oldest': None}})
+
+    # One tag per data version and query, so an unchanged page costs no JSON encoding
+    request_key = f"{snapshot.version}|{sort}|{order}|{query}|{page}|{per_page}"
+    etag = hashlib.sha1(request_key.encode('utf-8')).hexdigest()[:20]
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+
+    records = snapshot.sorted(sort, order)
+    if query:
+        records = [pr for pr in records if matches_query(pr, query)]
+    pages = (len(records) + per_page - 1) // per_page
+    start = (page - 1) * per_page
+
+    response = jsonify({
+        'press_releases': [pr.to_dict() for pr in records[start:start + per_page]],
+        'total': len(records),
+        'page': page,
+        'pages': pages,
+        'per_page': per_page,
+        'sort': sort,
+        'order': order,
+        'last_modified': snapshot.last_modified,
+        'stats': snapshot.stats,
+    })
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/search')
+def search():
+    """
+    Ranked full-text search over the scraped press releases
+
+    Query parameters: q (every word matches as a prefix; title matches rank highest), from and
+    to (inclusive YYYY-MM-DD dates), category, page and per_page. Without q the matches come
+    newest first.
+    """
+    bounds = {}
+    for name in ('from', 'to'):
+        value = request.args.get(name, '').strip()
+        if value and to_date(value) is None:
+            return jsonify({'error': f"'{name}' must be a YYYY-MM-DD date"}), 400
+        bounds[name] = to_date(value).isoformat() if value else None
+    query = request.args.get('q', '').strip()
+    per_page = int_arg('per_page', DEFAULT_PER_PAGE, 1, MAX_PER_PAGE)
+    page = int_arg('page', 1, 1, 1_000_000)
 
-    return jsonify(data)
+    try:
+        snapshot = data_cache.snapshot()
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        snapshot = None
+    results = synced_search_index(snapshot).search(query, bounds['from'], bounds['to'],
+                                                   request.args.get('category') or None,
+                                                   limit=per_page, offset=(page - 1) * per_page)
+
+    return jsonify({
+        'press_releases': [dict(pr.to_dict(), score=score) for pr, score in zip(results.records, results.scores)],
+        'query': query,
+        'total': results.total,
+        'page': page,
+        'pages': (results.total + per_page - 1) // per_page,
+        'per_page': per_page,
+        'last_modified': snapshot.last_modified if snapshot else None,
+        'stats': snapshot.stats if snapshot else {'count': 0, 'latest': None, 'oldest': None},
+    })
 
 @app.route('/api/scrape', methods=['POST'])
 def run_scraper():
-    """Run the scraper and return results"""
-    global scraper_status
-
-    if scraper_status['running']:
-        return jsonify({'success': False, 'message': 'Scraper is already running'})
-
-    scraper_status['running'] = True
-
-    try:
-        # Run the test scraper (doesn't require Google credentials)
-        result = subprocess.run(
-            ['python3', 'test_scraper.py'],
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
-
-        scraper_status['last_run'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-        if result.returncode == 0:
-            # Count how many were scraped
-            if os.path.exists(DATA_FILE):
-                with open(DATA_FILE, 'r') as f:
-                    data = json.load(f)
-                count = len(data)
-                return jsonify({
-                    'success': True,
-                    'message': f'Successfully scraped {count} press releases!'
-                })
-            return jsonify({'success': True, 'message': 'Scraper completed'})
-        else:
-            return jsonify({
-                'success': False,
-                'message': f'Scraper error: {result.stderr[:200]}'
-            })
-    except subprocess.TimeoutExpired:
-        return jsonify({'success': False, 'message': 'Scraper timed out'})
-    except Exception as e:
-        return jsonify({'success': False, 'message': str(e)})
-    finally:
-        scraper_status['running'] = False
+    """Start a background scrape (or join the one in progress) and return its job id"""
+    job, created = scrape_jobs.submit()
+    message = 'Scrape started' if created else 'Scraper is already running - following the current run'
+    return jsonify({'success': True, 'created': created, 'message': message, 'job': job.to_dict()}), 202
+
+@app.route('/api/jobs')
+def list_jobs():
+    """Return recent scrape jobs, newest first, and the active one if any"""
+    current = scrape_jobs.current()
+    return jsonify({
+        'current': current.to_dict() if current else None,
+        'jobs': [job.to_dict() for job in scrape_jobs.jobs()],
+    })
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Return one scrape job's state, progress and result"""
+    job = scrape_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': f'Unknown job {job_id}'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/events')
+def stream_events():
+    """Server-Sent Events stream of scrape progress (resumes after Last-Event-ID on reconnect)"""
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('after')
+    last_id = int(last_id) if last_id and last_id.isdigit() else None
+
+    def generate():
+        # Tell EventSource to reconnect quickly if the stream drops
+        yield 'retry: 2000\n\n'
+        for item in events.listen(last_id):
+            yield format_sse(item)
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 if __name__ == '__main__':
     print("\n" + "="*50)
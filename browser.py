@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Warm Chrome session pool for the Opsera Press Release Scraper
+Resolves ChromeDriver once, keeps headless sessions alive between uses and recycles them after a while
+"""
+
+import os
+import queue
+import stat
+import threading
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+from fetcher import USER_AGENT
+
+
+# Resolved driver path, remembered across processes so ChromeDriverManager's version check runs once.
+# It lives in the user's own cache directory (0700 dir, 0600 file): a path other users could plant
+# would make the scraper execute their binary
+DRIVER_PATH_FILE = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                                'opsera-scraper', 'chromedriver-path')
+
+# Resource URL patterns Chrome never downloads (CDP Network.setBlockedURLs wildcards)
+BLOCKED_RESOURCE_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.css',
+    '*.mp4', '*.webm', '*.mov', '*.m3u8', '*.mp3', '*.m4a', '*.ogg', '*.wav',
+]
+
+# Third-party hosts the listing and article pages load but extraction never needs:
+# analytics, tag managers, chat widgets and social/video embeds. The site's own scripts
+# come from its CDN, so this is a blocklist rather than a first-party allowlist
+THIRD_PARTY_DOMAINS = [
+    'googletagmanager.com', 'google-analytics.com', 'analytics.google.com', 'doubleclick.net',
+    'googlesyndication.com', 'facebook.net', 'facebook.com',
+    'linkedin.com', 'licdn.com', 'x.com', 'twitter.com', 'twimg.com',
+    'youtube.com', 'youtube-nocookie.com', 'ytimg.com', 'vimeo.com', 'wistia.com', 'wistia.net',
+    'hotjar.com', 'clarity.ms', 'hs-scripts.com', 'hs-analytics.net', 'hsforms.net', 'hubspot.com',
+    'segment.com', 'segment.io', 'intercom.io', 'drift.com', 'zoominfo.com',
+    'cookieyes.com', 'cookielaw.org',
+]
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def _find_chromedriver(driver_path):
+    """Work around webdriver-manager returning a LICENSE/NOTICE file instead of the binary (Mac ARM)"""
+    if 'THIRD_PARTY' in driver_path or 'LICENSE' in driver_path or not driver_path.endswith('chromedriver'):
+        driver_dir = os.path.dirname(driver_path)
+        for root, dirs, files in os.walk(os.path.dirname(driver_dir)):
+            if 'chromedriver' in files:
+                potential = os.path.join(root, 'chromedriver')
+                if 'LICENSE' not in potential and 'NOTICE' not in potential:
+                    return potential
+    return driver_path
+
+
+def _read_remembered_driver_path():
+    """Return the remembered driver path, or None unless the file is ours and private"""
+    try:
+        fd = os.open(DRIVER_PATH_FILE, os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0))
+    except OSError:
+        return None
+    with open(fd, 'r', encoding='utf-8') as f:
+        info = os.fstat(f.fileno())
+        if info.st_uid != os.getuid() or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            print(f"Warning: Ignoring {DRIVER_PATH_FILE} - it is not private to this user")
+            return None
+        return f.read().strip() or None
+
+
+def _remember_driver_path(driver_path):
+    """Store the driver path for later processes, readable and writable by this user only"""
+    try:
+        os.makedirs(os.path.dirname(DRIVER_PATH_FILE), mode=0o700, exist_ok=True)
+        fd = os.open(DRIVER_PATH_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_NOFOLLOW', 0), 0o600)
+        with open(fd, 'w', encoding='utf-8') as f:
+            os.fchmod(f.fileno(), 0o600)
+            f.write(driver_path)
+    except OSError as e:
+        print(f"Warning: Could not remember the ChromeDriver path: {e}")
+
+
+def forget_driver_path():
+    """Drop the resolved driver path, e.g. after Chrome was updated past it"""
+    global _driver_path
+    with _driver_path_lock:
+        _driver_path = None
+        try:
+            os.remove(DRIVER_PATH_FILE)
+        except OSError:
+            pass
+
+
+def resolve_driver_path(refresh=False):
+    """
+    Return the ChromeDriver binary path, resolving it at most once per user
+
+    refresh skips the remembered path and asks ChromeDriverManager again (CHROMEDRIVER_PATH
+    still wins, since it is the user's explicit choice).
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if not refresh and _driver_path and os.path.isfile(_driver_path):
+            return _driver_path
+
+        driver_path = os.environ.get('CHROMEDRIVER_PATH')
+        if not driver_path and not refresh:
+            driver_path = _read_remembered_driver_path()
+        if not driver_path or not os.path.isfile(driver_path):
+            driver_path = _find_chromedriver(ChromeDriverManager().install())
+            _remember_driver_path(driver_path)
+
+        # Ensure executable (by this user only; never widen access for group or others)
+        if os.path.isfile(driver_path) and not os.access(driver_path, os.X_OK):
+            os.chmod(driver_path, os.stat(driver_path).st_mode | stat.S_IXUSR)
+
+        print(f"Using ChromeDriver at: {driver_path}")
+        _driver_path = driver_path
+        return driver_path
+
+
+def chrome_options():
+    """Headless Chrome options shared by every session"""
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument(f"user-agent={USER_AGENT}")
+    return options
+
+
+def domain_patterns(domains):
+    """Turn bare domains into setBlockedURLs wildcards matching the domain and its subdomains"""
+    patterns = []
+    for domain in domains:
+        patterns.extend([f"*://{domain}/*", f"*://*.{domain}/*"])
+    return patterns
+
+
+class RenderingProfile:
+    """How much of each page Chrome loads: page-load strategy, images and blocked requests"""
+
+    def __init__(self, name, page_load_strategy='eager', images=False, blocked_patterns=None,
+                 blocked_domains=None):
+        """
+        Initialize the profile
+
+        Args:
+            name: Key used to pick the profile with RENDERING_PROFILE
+            page_load_strategy: WebDriver pageLoadStrategy - 'eager' returns from get() at
+                DOMContentLoaded, 'normal' waits for the load event
+            images: Let Chrome decode and download images at all
+            blocked_patterns: URL wildcards never requested (see BLOCKED_RESOURCE_PATTERNS)
+            blocked_domains: Hosts (and their subdomains) never contacted
+        """
+        self.name = name
+        self.page_load_strategy = page_load_strategy
+        self.images = images
+        self.blocked_urls = list(blocked_patterns or []) + domain_patterns(blocked_domains or [])
+
+    @property
+    def document_state(self):
+        """document.readyState that counts as loaded under this profile's load strategy"""
+        return 'complete' if self.page_load_strategy == 'normal' else 'interactive'
+
+    def apply_options(self, options):
+        """Set the launch-time parts of the profile on ChromeOptions"""
+        options.page_load_strategy = self.page_load_strategy
+        if not self.images:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        return options
+
+    def apply_network(self, driver):
+        """Install the request blocklist in a running Chrome through the DevTools protocol"""
+        if self.blocked_urls:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls})
+
+
+# 'light' renders just enough DOM to read listing cards and article markup; 'full' loads
+# pages like a normal browser, e.g. for debugging what the blocklist hides
+RENDERING_PROFILES = {
+    'light': RenderingProfile('light', blocked_patterns=BLOCKED_RESOURCE_PATTERNS,
+                              blocked_domains=THIRD_PARTY_DOMAINS),
+    'full': RenderingProfile('full', page_load_strategy='normal', images=True),
+}
+
+
+def get_rendering_profile(profile):
+    """Return a RenderingProfile for a profile or a RENDERING_PROFILES name"""
+    if isinstance(profile, RenderingProfile):
+        return profile
+    if profile not in RENDERING_PROFILES:
+        raise ValueError(f"unknown rendering profile '{profile}' (choose from {', '.join(RENDERING_PROFILES)})")
+    return RENDERING_PROFILES[profile]
+
+
+def launch_chrome(profile='light'):
+    """Start a headless Chrome with a rendering profile (object or RENDERING_PROFILES name)"""
+    profile = get_rendering_profile(profile)
+    try:
+        driver = webdriver.Chrome(service=Service(resolve_driver_path()),
+                                  options=profile.apply_options(chrome_options()))
+    except SessionNotCreatedException as e:
+        if os.environ.get('CHROMEDRIVER_PATH'):
+            raise
+        # Usually Chrome updated past the remembered driver - fetch a matching one and retry once
+        print(f"Warning: ChromeDriver could not start Chrome ({e.msg}), resolving the driver again")
+        forget_driver_path()
+        driver = webdriver.Chrome(service=Service(resolve_driver_path(refresh=True)),
+                                  options=profile.apply_options(chrome_options()))
+    profile.apply_network(driver)
+    return driver
+
+
+class BrowserSession:
+    """A pooled Chrome driver and how many leases it has served"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+    def quit(self):
+        """Shut the browser down, ignoring one that already died"""
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"Warning: Could not quit Chrome cleanly: {e}")
+
+
+class BrowserPool:
+    """Keep up to size warm Chrome sessions and lease them out one caller at a time"""
+
+    def __init__(self, size=1, max_uses=50, profile='light'):
+        """
+        Initialize the pool (no browser starts until start() or the first lease)
+
+        Args:
+            size: Maximum number of Chrome sessions alive at once
+            max_uses: Leases a session serves before it is replaced with a fresh one
+            profile: RenderingProfile (or RENDERING_PROFILES name) every session is launched with
+        """
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.profile = get_rendering_profile(profile)
+        self._idle = queue.Queue()
+        self._alive = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _launch(self):
+        return BrowserSession(launch_chrome(self.profile))
+
+    def start(self):
+        """Warm the pool up to size sessions, launching them in parallel"""
+        with self._lock:
+            missing = self.size - self._alive
+            self._alive += missing
+        threads = [threading.Thread(target=self._launch_idle) for _ in range(missing)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _launch_idle(self):
+        """Launch a session into the idle queue (its slot is already counted in _alive)"""
+        try:
+            session = self._launch()
+        except Exception as e:
+            print(f"Warning: Could not start Chrome: {e}")
+            with self._lock:
+                self._alive -= 1
+            return
+
+        with self._lock:
+            closed = self._closed
+            if closed:
+                self._alive -= 1
+            else:
+                self._idle.put(session)
+        # The pool was closed while this browser started; close() could not see it
+        if closed:
+            session.quit()
+
+    def acquire(self):
+        """Lease a session, starting one when none is idle and the pool has room"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_launch = self._alive < self.size
+            if can_launch:
+                self._alive += 1
+        if can_launch:
+            try:
+                return self._launch()
+            except Exception:
+                with self._lock:
+                    self._alive -= 1
+                raise
+        return self._idle.get()
+
+    def release(self, session, broken=False):
+        """Return a leased session; worn-out or broken ones are replaced in the background"""
+        session.uses += 1
+        if not broken and not self._closed and session.uses < self.max_uses:
+            try:
+                # Leave nothing from this lease behind for the next caller
+                session.driver.delete_all_cookies()
+                session.driver.get('about:blank')
+                reusable = True
+            except WebDriverException:
+                reusable = False
+            if reusable:
+                with self._lock:
+                    # Checked under the lock: once close() has drained the queue nobody would quit it
+                    if not self._closed:
+                        self._idle.put(session)
+                        return
+
+        session.quit()
+        if self._closed:
+            with self._lock:
+                self._alive -= 1
+            return
+        threading.Thread(target=self._launch_idle, daemon=True).start()
+
+    @contextmanager
+    def lease(self):
+        """Context manager yielding a WebDriver from the pool"""
+        session = self.acquire()
+        broken = False
+        try:
+            yield session.driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self.release(session, broken=broken)
+
+    def close(self):
+        """Quit every idle session; leased and still-launching ones are quit when they finish"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            session.quit()
+            with self._lock:
+                self._alive -= 1
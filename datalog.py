@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Crash-safe data file for the Opsera Press Release Scraper
+Records go to an append-only NDJSON log as they are extracted and are compacted into atomically replaced JSON snapshots
+"""
+
+import json
+import os
+import tempfile
+import time
+from record import PressRelease
+
+
+def read_snapshot(path):
+    """
+    Return (records, os.stat_result) for a JSON snapshot, or (None, None) when it does not exist
+
+    The stat comes from the open file descriptor, so it always describes the version that was
+    parsed even if a writer replaces the file in between.
+    """
+    try:
+        f = open(path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return None, None
+    with f:
+        stat = os.fstat(f.fileno())
+        records = [PressRelease.from_dict(item) for item in json.load(f)]
+    return records, stat
+
+
+def write_snapshot(path, records):
+    """Atomically replace path with a JSON array of records (readers see the old or the new file)"""
+    # A unique temp file per writer, so concurrent runs (CLI and a web app job) cannot clobber each other's
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=f"{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.fchmod(fd, mode)  # mkstemp creates 0600; keep the snapshot readable as before
+        with open(fd, 'w', encoding='utf-8') as f:
+            json.dump([record.to_dict() for record in records], f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
+
+
+def read_log(path):
+    """Yield the records of an NDJSON log, skipping a line torn by a crash"""
+    try:
+        f = open(path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return
+    with f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield PressRelease.from_dict(json.loads(line))
+            except (ValueError, KeyError) as e:
+                print(f"Warning: Skipping unreadable line {number} of {path}: {e}")
+
+
+class DataLog:
+    """Deduplicated record file backed by an append-only log and periodic compaction"""
+
+    def __init__(self, path, log_path=None, compact_ratio=0.5, compact_min_bytes=256 * 1024,
+                 fsync_interval=1.0):
+        """
+        Initialize the data log (nothing is read until open())
+
+        Args:
+            path: JSON snapshot readers use, e.g. scraped_data.json
+            log_path: NDJSON log of records not yet compacted (defaults to path + '.log')
+            compact_ratio: Compact once the log grows past this fraction of the snapshot size,
+                so rewrites cost O(records written) overall rather than one snapshot per batch
+            compact_min_bytes: Log size below which a run never compacts before close()
+            fsync_interval: Seconds between fsyncs of the log; a crash loses at most the
+                records written in that window (0 syncs every record)
+        """
+        self.path = path
+        self.log_path = log_path or f"{path}.log"
+        self.compact_ratio = compact_ratio
+        self.compact_min_bytes = compact_min_bytes
+        self.fsync_interval = fsync_interval
+        self.records = {}  # link -> PressRelease, in first-seen order
+        self.pending = 0
+        self._log = None
+        self._log_bytes = 0
+        self._snapshot_bytes = 0
+        self._last_fsync = time.monotonic()
+
+    def open(self):
+        """Load the snapshot, fold in a log left by an interrupted run and start a new log"""
+        records, stat = read_snapshot(self.path)
+        for record in records or []:
+            self.records[record.link] = record
+        self._snapshot_bytes = stat.st_size if stat else 0
+
+        recovered = 0
+        for record in read_log(self.log_path):
+            self.records[record.link] = record
+            recovered += 1
+        if recovered:
+            print(f"  Recovered {recovered} records from an interrupted run ({self.log_path})")
+            self.compact()
+        self._log = open(self.log_path, 'a', encoding='utf-8')
+
+    def append(self, record):
+        """
+        Log one record (latest version of a link wins); return False when it was already stored as is
+
+        Records served unchanged from the article store are skipped, so a run with nothing new
+        writes nothing.
+        """
+        if self.records.get(record.link) == record:
+            return False
+        line = json.dumps(record.to_dict(), ensure_ascii=False) + '\n'
+        self._log.write(line)
+        self._log.flush()
+        self._log_bytes += len(line.encode('utf-8'))
+        if time.monotonic() - self._last_fsync >= self.fsync_interval:
+            self._sync()
+        self.records[record.link] = record
+        self.pending += 1
+        if self._log_bytes >= max(self.compact_min_bytes, self.compact_ratio * self._snapshot_bytes):
+            self.compact()
+        return True
+
+    def _sync(self):
+        os.fsync(self._log.fileno())
+        self._last_fsync = time.monotonic()
+
+    def compact(self):
+        """
+        Write every record to a fresh snapshot, then empty the log
+
+        The snapshot is replaced before the log is truncated; a crash in between leaves log
+        entries that are already in the snapshot, which the next open() folds in again harmlessly.
+        """
+        write_snapshot(self.path, self.records.values())
+        if self._log is not None:
+            self._log.seek(0)
+            self._log.truncate()
+        else:
+            open(self.log_path, 'w').close()
+        self.pending = 0
+        self._log_bytes = 0
+        self._snapshot_bytes = os.path.getsize(self.path)
+
+    def close(self):
+        """Compact whatever is pending and remove the empty log"""
+        if self._log is None:
+            return
+        if self.pending or not os.path.exists(self.path):
+            self.compact()
+        self._log.close()
+        self._log = None
+        os.remove(self.log_path)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Browserless listing discovery for the Opsera Press Release Scraper
+Walks the WordPress REST API behind the newsroom instead of clicking through it in Chrome
+"""
+
+import json
+import os
+import re
+import xml.etree.ElementTree as ElementTree
+from bs4 import BeautifulSoup
+
+
+FILTER_DATA_PATTERN = re.compile(r'knightowl_blocks_filter_data\s*=\s*(\{.*?\});')
+
+# Cheap change indicators, checked in order until one answers
+DEFAULT_FEED_URLS = [
+    'https://opsera.ai/feed/?post_type=press',
+    'https://opsera.ai/wp-sitemap-posts-press-1.xml',
+]
+
+
+class DiscoveryError(Exception):
+    """Raised when a listing cannot be discovered without a browser"""
+
+
+def links_from_feed(content, link_filter=lambda link: True):
+    """Return article links from RSS <link> or sitemap <loc> elements, in feed order"""
+    root = ElementTree.fromstring(content)
+    links = []
+    for element in root.iter():
+        tag = element.tag.rsplit('}', 1)[-1]
+        if tag in ('link', 'loc') and element.text:
+            link = element.text.strip()
+            if link_filter(link) and link not in links:
+                links.append(link)
+    return links
+
+
+class WordPressRestDiscovery:
+    """Discover article links for one taxonomy term of a WordPress post type"""
+
+    def __init__(self, fetcher, site_url='https://opsera.ai', listing_url='https://opsera.ai/newsroom/',
+                 post_type='press', taxonomy='press-type', term='press-release', per_page=100):
+        """
+        Initialize the discovery backend
+
+        Args:
+            fetcher: fetcher.HttpFetcher used for the API calls
+            site_url: Root of the WordPress site
+            listing_url: Page hosting the filterable post loop (used by the filter endpoint)
+            post_type: REST base of the post type, e.g. 'press'
+            taxonomy: REST base of the filtering taxonomy, e.g. 'press-type' (None lists every post)
+            term: Taxonomy term slug to keep, e.g. 'press-release' (None lists every post)
+            per_page: Page size for wp/v2 requests (WordPress caps this at 100)
+        """
+        self.fetcher = fetcher
+        self.site_url = site_url.rstrip('/')
+        self.listing_url = listing_url
+        self.post_type = post_type
+        self.taxonomy = taxonomy
+        self.term = term
+        self.per_page = per_page
+
+    def discover(self):
+        """Return all article links, newest first, trying each REST strategy in turn"""
+        return list(self.iter_links())
+
+    def iter_links(self):
+        """
+        Yield article links, newest first, one result page at a time
+
+        A strategy that fails before producing any link hands over to the next one;
+        once links have been yielded, errors propagate to the caller.
+        """
+        errors = []
+        for name, strategy in [('wp/v2', self._discover_wp_v2), ('filter', self._discover_filter_endpoint)]:
+            count = 0
+            try:
+                for link in strategy():
+                    count += 1
+                    yield link
+            except Exception as e:
+                if count:
+                    raise
+                errors.append(f"{name}: {e}")
+                continue
+            if count:
+                print(f"  Discovered {count} links via the {name} REST API")
+                return
+            errors.append(f"{name}: no results")
+
+        raise DiscoveryError('; '.join(errors))
+
+    def _discover_wp_v2(self):
+        """Page through /wp-json/wp/v2/<post_type> filtered by the term id, yielding links"""
+        api = f"{self.site_url}/wp-json/wp/v2"
+
+        params = {
+            'per_page': self.per_page,
+            'orderby': 'date',
+            'order': 'desc',
+            '_fields': 'link',
+        }
+        if self.taxonomy and self.term:
+            terms = self.fetcher.request('GET', f"{api}/{self.taxonomy}",
+                                         params={'slug': self.term, '_fields': 'id'}).json()
+            if not terms:
+                raise DiscoveryError(f"unknown {self.taxonomy} term '{self.term}'")
+            params[self.taxonomy] = terms[0]['id']
+
+        page = 1
+        total_pages = 1
+        while page <= total_pages:
+            response = self.fetcher.request('GET', f"{api}/{self.post_type}", params=dict(params, page=page))
+            total_pages = int(response.headers.get('X-WP-TotalPages', page))
+            for post in response.json():
+                if post.get('link'):
+                    yield post['link']
+            page += 1
+
+    def _discover_filter_endpoint(self):
+        """Replay the knightowl post-loop filter requests the newsroom page sends via AJAX, yielding links"""
+        if not (self.taxonomy and self.term):
+            raise DiscoveryError('the filter endpoint needs a taxonomy term')
+        page_html = self.fetcher.fetch(self.listing_url)
+
+        match = FILTER_DATA_PATTERN.search(page_html)
+        if not match:
+            raise DiscoveryError('filter endpoint settings not found on listing page')
+        filter_data = json.loads(match.group(1))
+
+        soup = BeautifulSoup(page_html, 'html.parser')
+        args = None
+        for block in soup.select('.knightowl-blocks-post-loop[data-args]'):
+            block_args = json.loads(block['data-args'])
+            if self.post_type in block_args.get('post_type', []) and block_args.get('post_loop_pagination'):
+                args = block_args
+                break
+        if args is None:
+            raise DiscoveryError('paginated post loop not found on listing page')
+
+        seen = set()
+        page = 1
+        while True:
+            args['paged'] = page
+            response = self.fetcher.request('POST', filter_data['ajaxurl'],
+                                            headers={'X-WP-Nonce': filter_data['nonce']},
+                                            json={'args': args, 'filters': {self.taxonomy: [self.term]}, 'paged': page})
+            page_links = [link for link in self._links_from_filter_response(response.json()) if link not in seen]
+            if not page_links:
+                break
+            seen.update(page_links)
+            yield from page_links
+            page += 1
+
+    def _links_from_filter_response(self, payload):
+        """Pull card links out of the rendered HTML returned by the filter endpoint"""
+        html = payload if isinstance(payload, str) else ''
+        if isinstance(payload, dict):
+            for key in ('html', 'content', 'data'):
+                if isinstance(payload.get(key), str):
+                    html = payload[key]
+                    break
+
+        soup = BeautifulSoup(html, 'html.parser')
+        return [a['href'] for a in soup.select('.grid-item h2 a[href]')]
+
+
+class FeedCheckResult:
+    """Outcome of a quick feed/sitemap check"""
+
+    def __init__(self, changed, new_links=None, feed_links=None, source=None):
+        self.changed = changed
+        self.new_links = new_links or []
+        self.feed_links = feed_links or []
+        self.source = source
+
+
+class FeedChecker:
+    """Detect new releases from the RSS feed or sitemap using conditional GETs"""
+
+    def __init__(self, fetcher, state_file='scraper_state.json', feed_urls=None,
+                 link_filter=lambda link: '/newsroom/' in link, feed_groups=None):
+        """
+        Initialize the checker
+
+        Args:
+            fetcher: fetcher.HttpFetcher used for the requests
+            state_file: JSON file holding feed validators and known links between runs
+            feed_urls: RSS feeds or sitemaps to try, in order
+            link_filter: Predicate selecting article links from the feed
+            feed_groups: Optional list of (feed_urls, link_filter) pairs, one per set of
+                sources, replacing feed_urls and link_filter; every group is checked and a
+                run is needed when any of them changed
+        """
+        self.fetcher = fetcher
+        self.state_file = state_file
+        self.feed_groups = feed_groups or [(feed_urls or DEFAULT_FEED_URLS, link_filter)]
+        self.state = self._load_state()
+        self._pending_validators = {}
+        self._pending_links = set()
+
+    def _load_state(self):
+        """Read the state file, starting fresh if it is missing or unreadable"""
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not read {self.state_file}: {e}")
+        return {'feeds': {}, 'known_links': []}
+
+    def check(self):
+        """Return a FeedCheckResult; changed is True whenever we cannot prove nothing is new"""
+        known_links = set(self.state.get('known_links', []))
+        results = [self._check_group(feed_urls, link_filter, known_links)
+                   for feed_urls, link_filter in self.feed_groups]
+        if len(results) == 1:
+            return results[0]
+        return FeedCheckResult(
+            any(result.changed for result in results),
+            new_links=[link for result in results for link in result.new_links],
+            feed_links=[link for result in results for link in result.feed_links],
+            source=', '.join(result.source for result in results),
+        )
+
+    def _check_group(self, feed_urls, link_filter, known_links):
+        """Check one group's feeds in order, stopping at the first that answers"""
+        for url in feed_urls:
+            validators = self.state.get('feeds', {}).get(url, {})
+            headers = {}
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+
+            try:
+                response = self.fetcher.request('GET', url, headers=headers)
+            except Exception as e:
+                print(f"  Quick check: {url} failed ({e})")
+                continue
+
+            if response.status_code == 304:
+                return FeedCheckResult(False, source=url)
+
+            try:
+                feed_links = links_from_feed(response.content, link_filter)
+            except ElementTree.ParseError as e:
+                print(f"  Quick check: could not parse {url} ({e})")
+                continue
+
+            self._pending_validators[url] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+            }
+            self._pending_links.update(feed_links)
+
+            new_links = [link for link in feed_links if link not in known_links]
+            # Without a previous run there is nothing to diff against, so always scrape
+            changed = bool(new_links) or not known_links
+            return FeedCheckResult(changed, new_links=new_links, feed_links=feed_links, source=url)
+
+        return FeedCheckResult(True, source='no feed reachable')
+
+    def record_success(self, scraped_links):
+        """Remember validators and links once a full run has processed them"""
+        feeds = self.state.setdefault('feeds', {})
+        feeds.update(self._pending_validators)
+
+        known_links = set(self.state.get('known_links', []))
+        known_links.update(scraped_links)
+        known_links.update(self._pending_links)
+        self.state['known_links'] = sorted(known_links)
+
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+In-process event bus for the Opsera Press Release Scraper
+The scraper publishes progress events; the web app fans them out to Server-Sent Events streams
+"""
+
+import json
+import queue
+import threading
+import time
+from collections import deque
+
+
+class Subscription:
+    """One listener's queue of pending events"""
+
+    def __init__(self, max_queue):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.lost = False  # fell too far behind and was cut off
+
+
+class EventBus:
+    """Thread-safe publish/subscribe with a replay buffer for reconnecting listeners"""
+
+    def __init__(self, history=500, max_queue=1000):
+        """
+        Initialize the bus
+
+        Args:
+            history: Recent events kept so a reconnecting listener can catch up (Last-Event-ID)
+            max_queue: Events buffered per listener before a stalled one is cut off
+        """
+        self.max_queue = max_queue
+        self._history = deque(maxlen=history)
+        self._subscriptions = set()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def publish(self, event, **data):
+        """Send an event to every listener and return it as {'id', 'event', 'time', 'data'}"""
+        with self._lock:
+            self._next_id += 1
+            item = {'id': self._next_id, 'event': event, 'time': time.time(), 'data': data}
+            self._history.append(item)
+            for subscription in list(self._subscriptions):
+                try:
+                    subscription.queue.put_nowait(item)
+                except queue.Full:
+                    # Never let a stalled browser tab hold back the scraper; it resumes from history
+                    subscription.lost = True
+                    self._subscriptions.discard(subscription)
+        return item
+
+    def subscribe(self, last_id=None):
+        """Register a listener, first replaying buffered events newer than last_id (if given)"""
+        subscription = Subscription(self.max_queue)
+        with self._lock:
+            if last_id is not None:
+                missed = [item for item in self._history if item['id'] > last_id]
+                for item in missed[-self.max_queue:]:
+                    subscription.queue.put_nowait(item)
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def listen(self, last_id=None, heartbeat=15):
+        """
+        Yield events as they are published, or None every heartbeat seconds of silence
+
+        The generator ends when the listener was cut off for falling behind; closing it
+        unsubscribes.
+        """
+        subscription = self.subscribe(last_id)
+        try:
+            while not (subscription.lost and subscription.queue.empty()):
+                try:
+                    yield subscription.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield None
+        finally:
+            self.unsubscribe(subscription)
+
+
+def format_sse(item):
+    """Encode an event (or None for a keep-alive comment) in the text/event-stream format"""
+    if item is None:
+        return ': keep-alive\n\n'
+    return f"id: {item['id']}\nevent: {item['event']}\ndata: {json.dumps(item['data'], ensure_ascii=False)}\n\n"
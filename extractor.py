@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Single-pass extraction engine for Opsera press release pages
+Reads JSON-LD/OpenGraph metadata from the <head> first, then collects any missing
+title, date and description in one walk over the parsed document
+"""
+
+import html as html_lib
+import json
+import re
+from datetime import datetime
+from html.parser import HTMLParser
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+from record import PressRelease
+
+try:
+    import lxml  # noqa: F401 - only probing for the faster parser backend
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+
+# Tried in order over the page text - the first pattern with a match wins
+DATE_PATTERNS = [
+    re.compile(r'(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}'),
+    re.compile(r'\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}'),
+    re.compile(r'\d{4}-\d{2}-\d{2}'),
+]
+
+DATE_FORMATS = [
+    '%B %d, %Y',      # January 15, 2025
+    '%B %d %Y',       # January 15 2025
+    '%d %B %Y',       # 15 January 2025
+    '%Y-%m-%d',       # 2025-01-15
+    '%Y-%m-%dT%H:%M:%S',  # ISO format
+    '%Y-%m-%dT%H:%M:%SZ',
+    '%b %d, %Y',      # Jan 15, 2025
+]
+
+# Same strings BeautifulSoup's get_text() uses (skips scripts, styles and comments)
+TEXT_TYPES = (NavigableString, CData)
+
+# Title candidates by priority: h1, h2.entry-title, .entry-title, article h2
+TITLE_H1, TITLE_H2_ENTRY, TITLE_ENTRY, TITLE_ARTICLE_H2 = range(4)
+
+# Description contexts by priority: article p, .entry-content p, main p, .content p
+DESC_ARTICLE, DESC_ENTRY_CONTENT, DESC_MAIN, DESC_CONTENT = range(4)
+
+MIN_DESCRIPTION_LENGTH = 50
+MAX_DESCRIPTION_LENGTH = 300
+
+# Head scanning works on raw markup so the (script-heavy) head never becomes a tree
+HEAD_END = re.compile(r'</head\s*>', re.I)
+
+# JSON-LD types whose fields describe the article itself
+ARTICLE_TYPES = {'Article', 'NewsArticle', 'BlogPosting', 'Report', 'TechArticle', 'AnalysisNewsArticle'}
+
+# Field sources, most reliable first
+META_FIELDS = {
+    'title': ['og:title', 'twitter:title'],
+    'date': ['article:published_time', 'og:published_time', 'date'],
+    'description': ['og:description', 'description', 'twitter:description'],
+}
+STRUCTURED_FIELDS = ['title', 'date', 'description']
+
+
+def parse_date(date_string):
+    """Parse date string into standardized format"""
+    if not date_string:
+        return ''
+
+    date_string = date_string.strip()
+
+    # ISO 8601 timestamps (with or without UTC offset) from <time> and JSON-LD
+    try:
+        return datetime.fromisoformat(date_string).strftime('%Y-%m-%d')
+    except ValueError:
+        pass
+
+    for fmt in DATE_FORMATS:
+        try:
+            dt = datetime.strptime(date_string, fmt)
+            return dt.strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+
+    return date_string
+
+
+def parse_html(html):
+    """Parse a page with the fastest available BeautifulSoup backend"""
+    return BeautifulSoup(html, PARSER)
+
+
+def truncate_description(text):
+    """Cap a description at MAX_DESCRIPTION_LENGTH characters"""
+    return text[:MAX_DESCRIPTION_LENGTH] + '...' if len(text) > MAX_DESCRIPTION_LENGTH else text
+
+
+def _jsonld_objects(value):
+    """Yield every JSON-LD object, flattening lists and @graph containers"""
+    if isinstance(value, list):
+        for item in value:
+            yield from _jsonld_objects(item)
+    elif isinstance(value, dict):
+        yield value
+        if '@graph' in value:
+            yield from _jsonld_objects(value['@graph'])
+
+
+def structured_fields(head_html):
+    """
+    Return title/date/description found in JSON-LD and meta tags of a page head
+
+    Uses the same HeadMetadataParser as head-only streaming, so a download the stream
+    parser judged complete always yields the same fields here.
+    """
+    parser = HeadMetadataParser()
+    parser.feed(head_html)
+    return parser.fields()
+
+
+def resolve_structured_fields(jsonld_blocks, meta):
+    """Pick title/date/description from raw JSON-LD blocks and a meta name -> content dict"""
+    fields = {}
+
+    for block in jsonld_blocks:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        for obj in _jsonld_objects(data):
+            types = obj.get('@type', [])
+            types = set(types if isinstance(types, list) else [types])
+            is_article = bool(types & ARTICLE_TYPES)
+            # WebPage names carry the site suffix, so only article types provide a title
+            # (SEO plugins often entity-encode JSON-LD strings, hence the unescape)
+            if is_article and isinstance(obj.get('headline'), str):
+                fields.setdefault('title', html_lib.unescape(obj['headline']))
+            if isinstance(obj.get('datePublished'), str):
+                fields.setdefault('date', obj['datePublished'])
+            if is_article and isinstance(obj.get('description'), str):
+                fields.setdefault('description', html_lib.unescape(obj['description']))
+
+    for field, keys in META_FIELDS.items():
+        if field not in fields:
+            for key in keys:
+                if meta.get(key):
+                    fields[field] = meta[key]
+                    break
+
+    return {field: value.strip() for field, value in fields.items() if value and value.strip()}
+
+
+class HeadMetadataParser(HTMLParser):
+    """Push parser that collects JSON-LD and meta tags while a page is still downloading"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+        self.jsonld_blocks = []
+        self.head_done = False
+        self._jsonld_parts = None
+        self._fields = None
+
+    def feed(self, data):
+        """Parse the next chunk of markup; everything after the head is ignored"""
+        if not self.head_done:
+            super().feed(data)
+
+    def handle_starttag(self, tag, attrs):
+        if self.head_done:
+            return
+        attributes = dict(attrs)
+        if tag == 'meta':
+            key = attributes.get('property') or attributes.get('name')
+            if key and attributes.get('content') is not None:
+                self.meta.setdefault(key.lower(), attributes['content'])
+                self._fields = None
+        elif tag == 'script' and (attributes.get('type') or '').lower() == 'application/ld+json':
+            self._jsonld_parts = []
+        elif tag == 'body':
+            self.head_done = True
+
+    def handle_endtag(self, tag):
+        if tag == 'script' and self._jsonld_parts is not None:
+            self.jsonld_blocks.append(''.join(self._jsonld_parts))
+            self._jsonld_parts = None
+            self._fields = None
+        elif tag == 'head':
+            self.head_done = True
+
+    def handle_data(self, data):
+        if self._jsonld_parts is not None:
+            self._jsonld_parts.append(data)
+
+    def fields(self):
+        """Return the structured fields seen so far"""
+        if self._fields is None:
+            self._fields = resolve_structured_fields(self.jsonld_blocks, self.meta)
+        return self._fields
+
+    def is_complete(self):
+        """Return True once title, date and description are all known"""
+        fields = self.fields()
+        return all(field in fields for field in STRUCTURED_FIELDS)
+
+
+class PressReleaseExtractor:
+    """Extract press release fields from head metadata, falling back to one pass over the body"""
+
+    def __init__(self, category='Press Release'):
+        """
+        Initialize the extractor
+
+        Args:
+            category: Category recorded on every extracted article
+        """
+        self.category = category
+
+    def extract(self, html, url, head_fields=None):
+        """
+        Return a PressRelease, parsing the body only when the head metadata falls short
+
+        head_fields are the structured fields a streaming fetch already parsed from this page
+        (FetchResult.head_fields); the head is only scanned again when they are missing.
+        """
+        if head_fields is not None:
+            fields = head_fields
+        else:
+            # A head-only fetch may stop before </head>, in which case everything received is head
+            head_end = HEAD_END.search(html)
+            fields = structured_fields(html[:head_end.start()] if head_end else html)
+        if all(field in fields for field in STRUCTURED_FIELDS):
+            return PressRelease.from_dict(self._record(url, fields))
+        return PressRelease.from_dict(self._extract_with_fields(parse_html(html), url, fields))
+
+    def extract_from_soup(self, soup, url):
+        """Return a PressRelease from an already parsed page"""
+        fields = structured_fields(str(soup.head)) if soup.head else {}
+        if all(field in fields for field in STRUCTURED_FIELDS):
+            return PressRelease.from_dict(self._record(url, fields))
+        return PressRelease.from_dict(self._extract_with_fields(soup, url, fields))
+
+    def _extract_with_fields(self, soup, url, fields):
+        """Fill in whatever the metadata did not provide with the body heuristics"""
+        data = self._extract_from_body(soup, url)
+        data.update(self._record(url, fields))
+        return data
+
+    def _record(self, url, fields):
+        """Build a (possibly partial) record from structured metadata fields"""
+        data = {'link': url}
+        if 'title' in fields:
+            data['title'] = fields['title']
+        if 'date' in fields:
+            data['date'] = parse_date(fields['date'])
+        if 'description' in fields:
+            data['description'] = truncate_description(fields['description'])
+        data['category'] = self.category
+        return data
+
+    def _extract_from_body(self, soup, url):
+        """Collect title, date and description heuristically in one walk over the document"""
+        titles = [None] * 4
+        descriptions = [None] * 4
+        time_elem = None
+        text_parts = []
+
+        # Iterative walk carrying the description contexts each node sits in
+        stack = [(soup, (False, False, False, False))]
+        while stack:
+            node, contexts = stack.pop()
+
+            if not isinstance(node, Tag):
+                if type(node) in TEXT_TYPES:
+                    text_parts.append(node)
+                continue
+
+            name = node.name
+            classes = node.get('class') or ()
+
+            if name == 'h1':
+                if titles[TITLE_H1] is None:
+                    titles[TITLE_H1] = node
+            elif name == 'h2':
+                if 'entry-title' in classes and titles[TITLE_H2_ENTRY] is None:
+                    titles[TITLE_H2_ENTRY] = node
+                if contexts[DESC_ARTICLE] and titles[TITLE_ARTICLE_H2] is None:
+                    titles[TITLE_ARTICLE_H2] = node
+            elif name == 'time':
+                if time_elem is None:
+                    time_elem = node
+            elif name == 'p' and any(contexts):
+                text = node.get_text(strip=True)
+                if len(text) > MIN_DESCRIPTION_LENGTH:
+                    for rank, inside in enumerate(contexts):
+                        if inside and descriptions[rank] is None:
+                            descriptions[rank] = text
+            if 'entry-title' in classes and titles[TITLE_ENTRY] is None:
+                titles[TITLE_ENTRY] = node
+
+            # Every field is final once the top-priority candidates exist - skip the rest of the page
+            if (titles[TITLE_H1] is not None and descriptions[DESC_ARTICLE] is not None
+                    and time_elem is not None and time_elem.get('datetime')):
+                break
+
+            if 'entry-content' in classes or 'content' in classes or name in ('article', 'main'):
+                contexts = (
+                    contexts[DESC_ARTICLE] or name == 'article',
+                    contexts[DESC_ENTRY_CONTENT] or 'entry-content' in classes,
+                    contexts[DESC_MAIN] or name == 'main',
+                    contexts[DESC_CONTENT] or 'content' in classes,
+                )
+            # Push children reversed so they pop in document order
+            stack.extend((child, contexts) for child in reversed(node.contents))
+
+        data = {'link': url}
+
+        title_elem = next((elem for elem in titles if elem is not None), None)
+        if title_elem is not None:
+            data['title'] = title_elem.get_text(strip=True)
+        else:
+            # Try to extract from URL
+            slug = url.rstrip('/').split('/')[-1]
+            data['title'] = slug.replace('-', ' ').title()
+
+        data['date'] = ''
+        if time_elem is not None and time_elem.get('datetime'):
+            data['date'] = parse_date(time_elem['datetime'])
+        else:
+            # The page text is only needed when no <time datetime> settles the date
+            page_text = ''.join(text_parts)
+            for pattern in DATE_PATTERNS:
+                match = pattern.search(page_text)
+                if match:
+                    data['date'] = parse_date(match.group())
+                    break
+            if not data['date'] and time_elem is not None:
+                data['date'] = parse_date(time_elem.get_text(strip=True))
+
+        text = next((desc for desc in descriptions if desc is not None), '')
+        data['description'] = truncate_description(text)
+
+        # Extract category/tags
+        data['category'] = self.category
+
+        return data
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Fetch backends for the Opsera Press Release Scraper
+Article pages are server-rendered, so they can be fetched without a browser
+"""
+
+import codecs
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from httpcache import CacheMiss
+from politeness import RETRY_STATUSES, PolitenessScheduler, parse_retry_after
+
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
+
+class FetchResult:
+    """A fetched page plus the validators needed to revalidate it later"""
+
+    def __init__(self, url, status, text=None, etag=None, last_modified=None, complete=True,
+                 head_fields=None):
+        self.url = url
+        self.status = status
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.complete = complete  # False when the download stopped early (head-only fetch)
+        self.head_fields = head_fields  # structured fields the stream parser collected, if streamed
+
+    @property
+    def not_modified(self):
+        return self.status == 304
+
+
+class HttpFetcher:
+    """Fetch pages over a pooled keep-alive HTTP session"""
+
+    def __init__(self, pool_size=10, timeout=20, scheduler=None, cache=None, offline=False,
+                 stream_parser_factory=None, stream_chunk_size=16384):
+        """
+        Initialize the fetcher
+
+        Args:
+            pool_size: Number of keep-alive connections kept per host
+            timeout: Seconds to wait for a response before giving up
+            scheduler: Optional politeness.PolitenessScheduler shared by all callers; it rate
+                limits each host and retries transient failures
+            cache: Optional httpcache.HttpCache; GET responses are stored and revalidated
+            offline: Serve GETs from the cache only and never touch the network
+            stream_parser_factory: Optional callable returning a push parser with feed()
+                and is_complete(); fetch_conditional streams pages through it and closes
+                the connection as soon as it reports complete
+            stream_chunk_size: Bytes read per chunk when streaming
+        """
+        self.timeout = timeout
+        self.scheduler = scheduler
+        self.cache = cache
+        self.offline = offline
+        self.stream_parser_factory = stream_parser_factory
+        self.stream_chunk_size = stream_chunk_size
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+        })
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(self, method, url, **kwargs):
+        """Send a rate-limited request and return the response, raising on HTTP errors"""
+        if method == 'GET' and self.cache is not None:
+            return self._cached_request(url, **kwargs)
+        if self.offline:
+            raise CacheMiss(f"{method} {url} is not available offline")
+        return self._send(method, url, **kwargs)
+
+    def _send(self, method, url, **kwargs):
+        """Send a request over the network, retrying timeouts, connection errors, 429s and 5xx"""
+        kwargs.setdefault('timeout', self.timeout)
+        if self.scheduler is None:
+            response = self.session.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response
+
+        attempt = 0
+        while True:
+            response = None
+            error = None
+            with self.scheduler.slot(url):
+                start = time.monotonic()
+                try:
+                    response = self.session.request(method, url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = e
+                self.scheduler.record(url, time.monotonic() - start, response.status_code if response is not None else None)
+
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                response.raise_for_status()
+                return response
+            if attempt >= self.scheduler.max_retries:
+                if error is not None:
+                    raise error
+                response.raise_for_status()
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+            delay = self.scheduler.retry_delay(url, attempt, retry_after)
+            reason = f"HTTP {response.status_code}" if response is not None else type(error).__name__
+            print(f"    {reason} from {url[:60]}, retry {attempt + 1}/{self.scheduler.max_retries} in {delay:.1f}s")
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _cached_request(self, url, params=None, headers=None, **kwargs):
+        """GET through the cache, revalidating stored entries with their validators"""
+        key = requests.Request('GET', url, params=params).prepare().url
+        entry = self.cache.get(key)
+
+        if self.offline:
+            if entry is None:
+                raise CacheMiss(f"{key} is not in the cache")
+            return self._response_from_cache(key, entry)
+
+        # A head-only entry cannot stand in for the whole page, so it is simply refetched
+        if entry is not None and not entry['complete']:
+            entry = None
+
+        headers = dict(headers or {})
+        # Callers that send their own validators expect to see the 304 themselves
+        caller_conditional = 'If-None-Match' in headers or 'If-Modified-Since' in headers
+        if entry is not None and not caller_conditional:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self._send('GET', key, headers=headers, **kwargs)
+        if response.status_code == 304:
+            if entry is not None:
+                self.cache.touch(key)
+                if not caller_conditional:
+                    return self._response_from_cache(key, entry)
+        elif response.status_code == 200:
+            self.cache.put(key, response)
+        return response
+
+    def _fetch_streaming(self, url, headers):
+        """
+        Download a page incrementally, stopping once the stream parser has what it needs
+
+        With a cache, the stored entry's validators are sent and a 304 is answered from the
+        cache (whole body or cached head). What was downloaded is stored either way, marked
+        partial when the download stopped early.
+        """
+        key = requests.Request('GET', url).prepare().url
+        entry = self.cache.get(key) if self.cache is not None else None
+        headers = dict(headers)
+        # Callers that send their own validators expect to see the 304 themselves
+        caller_conditional = 'If-None-Match' in headers or 'If-Modified-Since' in headers
+        if entry is not None and not caller_conditional:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self._send('GET', url, headers=headers, stream=True)
+        etag = response.headers.get('ETag', headers.get('If-None-Match'))
+        last_modified = response.headers.get('Last-Modified', headers.get('If-Modified-Since'))
+        if response.status_code == 304:
+            response.close()
+            if entry is not None:
+                self.cache.touch(key)
+                if not caller_conditional:
+                    text = entry['body'].decode(entry['encoding'] or 'utf-8', errors='replace')
+                    return FetchResult(url, 200, text, etag=entry['etag'], last_modified=entry['last_modified'],
+                                       complete=entry['complete'])
+            return FetchResult(url, 304, etag=etag, last_modified=last_modified)
+
+        parser = self.stream_parser_factory()
+        # Same charset fallback requests uses for response.text
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+        raw_chunks = []
+        text_chunks = []
+        complete = True
+        try:
+            for chunk in response.iter_content(chunk_size=self.stream_chunk_size):
+                raw_chunks.append(chunk)
+                text = decoder.decode(chunk)
+                text_chunks.append(text)
+                parser.feed(text)
+                if parser.is_complete():
+                    complete = False
+                    break
+            else:
+                text_chunks.append(decoder.decode(b'', final=True))
+        finally:
+            response.close()
+
+        # A cut-short body is stored as a partial entry: enough for revalidation and for
+        # replaying the head-metadata extraction, never served as the whole page
+        if self.cache is not None and response.status_code == 200:
+            response._content = b''.join(raw_chunks)
+            self.cache.put(key, response, complete=complete)
+
+        return FetchResult(url, response.status_code, ''.join(text_chunks),
+                           etag=etag, last_modified=last_modified, complete=complete,
+                           head_fields=parser.fields())
+
+    def _response_from_cache(self, url, entry):
+        """Rebuild a requests.Response from a cache entry"""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = entry['body']
+        response.encoding = entry['encoding']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        return response
+
+    def fetch(self, url):
+        """Return the HTML of a page"""
+        return self.request('GET', url).text
+
+    def fetch_conditional(self, url, etag=None, last_modified=None):
+        """Fetch a page unless it is unchanged since the given validators (status 304, no text)"""
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        if self.stream_parser_factory is not None and not self.offline:
+            return self._fetch_streaming(url, headers)
+
+        response = self.request('GET', url, headers=headers)
+        if response.status_code == 304:
+            return FetchResult(url, 304, etag=etag, last_modified=last_modified)
+        return FetchResult(url, response.status_code, response.text,
+                           etag=response.headers.get('ETag'),
+                           last_modified=response.headers.get('Last-Modified'))
+
+    def close(self):
+        """Release pooled connections"""
+        self.session.close()
+
+
+class SeleniumFetcher:
+    """Fetch pages through a Selenium WebDriver (runs page JavaScript)"""
+
+    def __init__(self, driver, waiter=None):
+        """
+        Initialize the fetcher
+
+        Args:
+            driver: WebDriver to navigate with (owned by the caller)
+            waiter: Optional waits.PageWaiter used to wait for the document to load
+        """
+        self.driver = driver
+        self.waiter = waiter
+
+    def fetch(self, url):
+        """Return the rendered HTML of a page"""
+        self.driver.get(url)
+        if self.waiter:
+            self.waiter.document_ready(f"article {url.rstrip('/').split('/')[-1][:40]}")
+        return self.driver.page_source
+
+    def fetch_conditional(self, url, etag=None, last_modified=None):
+        """Browsers do not expose validators, so this is always a full fetch"""
+        return FetchResult(url, 200, self.fetch(url))
+
+    def close(self):
+        """Nothing to release - the driver is closed by its owner"""
+        pass
+
+
+def create_fetcher(backend, driver=None, waiter=None, concurrency=1, rate_limit=0, cache=None, offline=False,
+                   stream_parser_factory=None, host_concurrency=None, max_retries=3):
+    """Create the article fetcher for a backend name ('http' or 'selenium')"""
+    if backend == 'http':
+        scheduler = PolitenessScheduler(rate=rate_limit, max_per_host=host_concurrency or max(1, concurrency),
+                                        max_retries=max_retries)
+        return HttpFetcher(pool_size=max(10, concurrency), scheduler=scheduler,
+                           cache=cache, offline=offline, stream_parser_factory=stream_parser_factory)
+    if backend == 'selenium':
+        if driver is None:
+            raise ValueError("The selenium fetch backend needs a WebDriver")
+        return SeleniumFetcher(driver, waiter=waiter)
+    raise ValueError(f"Unknown fetch backend: {backend}")
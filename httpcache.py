@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP response cache for the Opsera Press Release Scraper
+Stores compressed bodies with their validators so repeat fetches can be revalidated or replayed offline
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    encoding TEXT,
+    headers TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    complete INTEGER NOT NULL DEFAULT 1
+)
+'''
+
+# Response headers worth replaying from the cache
+KEPT_HEADERS = ['Content-Type', 'ETag', 'Last-Modified', 'X-WP-Total', 'X-WP-TotalPages']
+
+
+class CacheMiss(Exception):
+    """Raised in offline mode when a URL is not in the cache"""
+
+
+class HttpCache:
+    """SQLite-backed response cache with zlib-compressed bodies, a size cap and LRU eviction"""
+
+    def __init__(self, directory='.http_cache', max_bytes=200 * 1024 * 1024):
+        """
+        Initialize the cache
+
+        Args:
+            directory: Folder holding the cache database
+            max_bytes: Compressed size the cache is trimmed back to, least recently used first
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, 'responses.db')
+        self.max_bytes = max_bytes
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(SCHEMA)
+            columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(responses)')}
+            if 'complete' not in columns:
+                # Caches written before partial entries existed only hold whole bodies
+                self._conn.execute('ALTER TABLE responses ADD COLUMN complete INTEGER NOT NULL DEFAULT 1')
+
+    def get(self, url):
+        """Return the cached entry for a url (body decompressed), or None"""
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM responses WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            return None
+
+        entry = dict(row)
+        entry['body'] = zlib.decompress(entry['body'])
+        entry['headers'] = json.loads(entry['headers'] or '{}')
+        entry['complete'] = bool(entry['complete'])
+        return entry
+
+    def touch(self, url):
+        """Mark an entry as recently used"""
+        with self._lock, self._conn:
+            self._conn.execute('UPDATE responses SET last_used = ? WHERE url = ?', (time.time(), url))
+
+    def put(self, url, response, complete=True):
+        """
+        Store a successful requests.Response and evict old entries if over the size cap
+
+        complete=False marks a body cut short by a head-only fetch; it can still be revalidated
+        and replayed for head metadata, but is never served as the whole page.
+        """
+        body = zlib.compress(response.content, 6)
+        headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute('''
+                INSERT OR REPLACE INTO responses
+                    (url, body, size, encoding, headers, etag, last_modified, stored_at, last_used, complete)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (url, body, len(body), response.encoding, json.dumps(headers),
+                  response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now, int(complete)))
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits max_bytes (lock held)"""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for row in self._conn.execute('SELECT url, size FROM responses ORDER BY last_used').fetchall():
+            self._conn.execute('DELETE FROM responses WHERE url = ?', (row['url'],))
+            total -= row['size']
+            if total <= self.max_bytes:
+                break
+
+    def urls(self):
+        """Return every cached url, oldest entry first"""
+        with self._lock:
+            return [row['url'] for row in self._conn.execute('SELECT url FROM responses ORDER BY stored_at')]
+
+    def close(self):
+        """Close the cache database"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Background scrape jobs for the Opsera Press Release Scraper web app
+A single worker thread runs scrapes in-process; triggers that arrive while one is pending join it
+"""
+
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+# Job states; queued and running jobs are active
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+class Job:
+    """One scrape request: its state, progress counters and result"""
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex[:12]
+        self.status = QUEUED
+        self.created = _now()
+        self.started = None
+        self.finished = None
+        self.triggers = 1  # POSTs coalesced into this job
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self.status in ACTIVE_STATES
+
+    def update(self, **progress):
+        """Merge progress counters (called from the worker while the job runs)"""
+        with self._lock:
+            self.progress.update(progress)
+
+    def to_dict(self):
+        """JSON-ready snapshot of the job"""
+        with self._lock:
+            return {
+                'id': self.id,
+                'status': self.status,
+                'created': self.created,
+                'started': self.started,
+                'finished': self.finished,
+                'triggers': self.triggers,
+                'progress': dict(self.progress),
+                'result': self.result,
+                'error': self.error,
+            }
+
+
+class JobManager:
+    """Queue scrape jobs for one in-process worker and keep their history queryable"""
+
+    def __init__(self, run_job, history=20, events=None):
+        """
+        Initialize the manager (the worker thread starts with the first job)
+
+        Args:
+            run_job: Callable taking the Job, reporting progress through job.update() and
+                returning a JSON-ready result; an exception marks the job failed
+            history: Finished jobs kept for /api/jobs lookups
+            events: Optional events.EventBus receiving a 'job' event on every state change
+        """
+        self.run_job = run_job
+        self.history = history
+        self._jobs = OrderedDict()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.events = events
+        self._worker = None
+
+    def submit(self):
+        """
+        Enqueue a scrape and return (job, created)
+
+        While a job is queued or running, a new trigger joins it instead of queueing a
+        second scrape of the same sites, so created is False.
+        """
+        with self._lock:
+            current = self._current()
+            if current is not None:
+                current.triggers += 1
+                self._publish(current)
+                return current, False
+
+            job = Job()
+            self._jobs[job.id] = job
+            self._prune()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._work, name='scrape-worker', daemon=True)
+                self._worker.start()
+        self._publish(job)
+        self._queue.put(job)
+        return job, True
+
+    def get(self, job_id):
+        """Return a job by id, or None"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def current(self):
+        """Return the queued or running job, or None"""
+        with self._lock:
+            return self._current()
+
+    def jobs(self):
+        """Return known jobs, newest first"""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def _current(self):
+        return next((job for job in reversed(self._jobs.values()) if job.active), None)
+
+    def _publish(self, job):
+        if self.events is not None:
+            self.events.publish('job', **job.to_dict())
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond the history limit (lock held)"""
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            with self._lock:
+                job.status = RUNNING
+                job.started = _now()
+            self._publish(job)
+            try:
+                result = self.run_job(job)
+                status, error = SUCCEEDED, None
+            except Exception as e:
+                print(f"Scrape job {job.id} failed: {e}")
+                result, status, error = None, FAILED, str(e)
+            with self._lock:
+                job.result = result
+                job.error = error
+                job.finished = _now()
+                job.status = status
+            self._publish(job)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Streaming pipeline stages for the Opsera Press Release Scraper
+Small generator stages joined by bounded queues, so records flow to the sinks while discovery is still paginating
+"""
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+_DONE = object()
+
+
+def background(iterable, maxsize=100):
+    """
+    Run an iterable in its own thread and yield its items through a bounded queue
+
+    The producer blocks once maxsize items are waiting (back-pressure). Exceptions raised by
+    the producer are re-raised in the consumer; closing the generator stops the producer.
+    """
+    items = queue.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as e:
+            put((_DONE, e))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
+
+
+def bounded_map(func, iterable, workers, max_pending=None):
+    """
+    Apply func to items on a thread pool and yield results in input order
+
+    Unlike Executor.map, items are pulled from the iterable lazily: at most max_pending calls
+    are in flight, and the futures deque doubles as the reorder buffer that keeps the output
+    order deterministic however the workers finish.
+    """
+    max_pending = max_pending or workers * 2
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for item in iterable:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def interleave(iterables):
+    """Round-robin over several iterables until every one is exhausted"""
+    iterators = deque(iter(iterable) for iterable in iterables)
+    while iterators:
+        iterator = iterators.popleft()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            continue
+        iterators.append(iterator)
+        yield item
+
+
+def unique(iterable, key=lambda item: item, seen=None):
+    """Yield items whose key has not been seen yet (seen may be shared across calls)"""
+    seen = set() if seen is None else seen
+    for item in iterable:
+        item_key = key(item)
+        if item_key in seen:
+            continue
+        seen.add(item_key)
+        yield item
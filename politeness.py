@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Per-host request scheduling for the Opsera Press Release Scraper
+Token-bucket rates, per-host concurrency, Retry-After handling and jittered backoff that adapts to the server
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Responses worth another attempt: throttling and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value):
+    """Return the seconds a Retry-After header asks for (delta-seconds or HTTP-date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostState:
+    """Token bucket, concurrency gate and latency estimate for one host"""
+
+    def __init__(self, rate, burst, max_concurrency):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.latency = None  # exponentially weighted moving average, seconds
+        self.gate = threading.BoundedSemaphore(max_concurrency)
+
+
+class PolitenessScheduler:
+    """Decide when each request to a host may go out, and how long to back off after a failure"""
+
+    def __init__(self, rate=2.0, burst=1, max_per_host=4, min_rate=0.2, target_latency=2.0,
+                 max_retries=3, backoff_base=1.0, backoff_max=60.0):
+        """
+        Initialize the scheduler
+
+        Args:
+            rate: Requests per second allowed per host; also the ceiling the adaptive rate
+                recovers to (0 disables rate limiting, concurrency and retries still apply)
+            burst: Tokens a host's bucket can hold, i.e. requests sent back to back after a pause
+            max_per_host: Requests in flight to one host at a time
+            min_rate: Floor the adaptive rate never drops below
+            target_latency: Response time in seconds above which the host is treated as struggling
+            max_retries: Extra attempts for timeouts, connection errors, 429 and 5xx responses
+            backoff_base: First retry delay cap in seconds (doubles per attempt, full jitter)
+            backoff_max: Upper bound for a single retry delay
+        """
+        self.max_rate = rate
+        self.burst = burst
+        self.max_per_host = max_per_host
+        self.min_rate = min(min_rate, rate) if rate else 0
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = HostState(self.max_rate, self.burst, self.max_per_host)
+            return self._hosts[host]
+
+    def _reserve(self, state):
+        """Take a token (possibly borrowing ahead) and return how long to sleep (lock held)"""
+        now = time.monotonic()
+        delay = max(0.0, state.blocked_until - now)
+        if state.rate:
+            state.tokens = min(self.burst, state.tokens + (now - state.updated) * state.rate)
+            state.updated = now
+            state.tokens -= 1
+            if state.tokens < 0:
+                delay = max(delay, -state.tokens / state.rate)
+        return delay
+
+    @contextmanager
+    def slot(self, url):
+        """Hold one of the host's concurrency slots and wait for its rate limit before yielding"""
+        state = self._host(url)
+        with state.gate:
+            with self._lock:
+                delay = self._reserve(state)
+            if delay:
+                time.sleep(delay)
+            yield
+
+    def record(self, url, latency, status=None):
+        """
+        Feed back the outcome of a request (status None for a network error)
+
+        AIMD: throttling, errors and slow responses halve the host's rate; healthy fast
+        responses add back a tenth of the ceiling per request.
+        """
+        if not self.max_rate:
+            return
+        state = self._host(url)
+        with self._lock:
+            state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+            struggling = status is None or status in RETRY_STATUSES or state.latency > self.target_latency
+            if struggling:
+                state.rate = max(self.min_rate, state.rate / 2)
+            else:
+                state.rate = min(self.max_rate, state.rate + self.max_rate / 10)
+
+    def retry_delay(self, url, attempt, retry_after=None):
+        """
+        Return the seconds to wait before retry number attempt (0-based)
+
+        A Retry-After value is honoured as given and also holds back every other request
+        to the host; otherwise the delay is exponential with full jitter.
+        """
+        if retry_after is not None:
+            delay = min(retry_after, self.backoff_max)
+            state = self._host(url)
+            with self._lock:
+                state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+            return delay
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def current_rate(self, url):
+        """Return the adaptive request rate currently used for the url's host"""
+        return self._host(url).rate
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Press release record type for the Opsera Press Release Scraper
+One slotted dataclass shared by the extractor, store, sinks, Google Sheet writer and web app
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional
+
+
+# Serialized field order (JSON, CSV, SQLite and Parquet columns)
+RECORD_FIELDS = ['link', 'title', 'date', 'description', 'category']
+
+DEFAULT_CATEGORY = 'Press Release'
+
+
+def to_date(value):
+    """Coerce a date, datetime or ISO 8601 string to a date (None when empty or unparseable)"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.strip()).date()
+    except ValueError:
+        return None
+
+
+def raw_date_text(value):
+    """Return the original text of a date string to_date() cannot parse, else ''"""
+    if isinstance(value, str) and to_date(value) is None:
+        return value.strip()
+    return ''
+
+
+@dataclass(slots=True)
+class PressRelease:
+    """
+    A single press release; date is a datetime.date (None when the page gave none)
+
+    A date the page gave in a form to_date() cannot parse (e.g. "March 3rd, 2024") is kept
+    verbatim in raw_date and serialized in place of the ISO date, so it is never lost; such
+    records sort and filter as undated.
+    """
+
+    link: str
+    title: str = ''
+    date: Optional[date] = None
+    description: str = ''
+    category: str = DEFAULT_CATEGORY
+    raw_date: str = ''
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a serialized dict (date as an ISO string); missing fields get defaults"""
+        return cls(
+            link=data['link'],
+            title=data.get('title') or '',
+            date=to_date(data.get('date')),
+            description=data.get('description') or '',
+            category=data.get('category') or DEFAULT_CATEGORY,
+            raw_date=raw_date_text(data.get('date')),
+        )
+
+    def set_date(self, value):
+        """Set the date from a date, datetime or string, keeping unparseable text in raw_date"""
+        self.date = to_date(value)
+        self.raw_date = raw_date_text(value)
+
+    @property
+    def date_text(self):
+        """The date as YYYY-MM-DD, the unparsed original text, or '' when unknown"""
+        return self.date.isoformat() if self.date else self.raw_date
+
+    def sort_key(self):
+        """Key for newest-first sorting with reverse=True; undated records sort last"""
+        return self.date or date.min
+
+    def values(self):
+        """Field values in RECORD_FIELDS order, with the date serialized"""
+        return [self.link, self.title, self.date_text, self.description, self.category]
+
+    def to_dict(self):
+        """Serialize to the JSON shape used by scraped_data.json and the web app"""
+        return dict(zip(RECORD_FIELDS, self.values()))
@@ -4,260 +4,492 @@ Opsera Press Release Scraper
 Scrapes press releases from opsera.ai and populates a Google Sheet
 """
 
-import time
-import re
+import itertools
 import os
-import stat
+import threading
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import WebDriverException
 import gspread
 from google.oauth2.service_account import Credentials
+from fetcher import create_fetcher
+from browser import BrowserPool, get_rendering_profile, launch_chrome
+from waits import PageWaiter
+from discovery import FeedChecker
+from store import ArticleStore, content_hash, record_from_row
+from httpcache import HttpCache
+from extractor import HeadMetadataParser, PressReleaseExtractor, parse_date
+from record import PressRelease, to_date
+from sheets import HEADERS, sheet_row, sync_sheet, write_sheet
+from sinks import create_sinks
+from pipeline import background, bounded_map, interleave, unique
+from sources import DEFAULT_SOURCES, NEWSROOM_ARTICLE, load_sources_file, resolve_sources
 
 
 class OpseraPressReleaseScraper:
-    def __init__(self, google_creds_file, sheet_name):
+    def __init__(self, google_creds_file, sheet_name, fetch_backend='http', concurrency=4, rate_limit=2.0,
+                 wait_timeouts=None, discovery='rest', quick_check=False, state_file='scraper_state.json',
+                 store_path='articles.db', recheck_after_days=30, http_cache_dir='.http_cache',
+                 http_cache_max_mb=200, replay_from_cache=False, head_only_fetch=True, sheet_sync='diff',
+                 output_sinks='', sources=None, sources_file=None, host_concurrency=None, max_retries=3,
+                 browser_pool=None, browser_pool_size=1, browser_max_uses=50, rendering_profile='light',
+                 events=None):
         """
         Initialize the scraper
 
         Args:
             google_creds_file: Path to Google Service Account JSON credentials
             sheet_name: Name of the Google Sheet to populate
+            fetch_backend: How article pages are loaded - 'http' (pooled requests
+                session) or 'selenium' (the same browser used for the listing)
+            concurrency: Number of article pages fetched in parallel (http backend only)
+            rate_limit: Maximum requests per second to a single host (0 disables). The
+                actual rate adapts below this ceiling when the host throttles or slows down
+            wait_timeouts: Optional per-step browser wait timeouts in seconds, keyed by
+                'cards', 'pagination' or 'document' (see waits.DEFAULT_STEP_TIMEOUTS)
+            discovery: How the listing is walked - 'rest' (WordPress REST API, with the
+                browser as fallback) or 'browser' (click through the newsroom in Chrome)
+            quick_check: Check the RSS feed/sitemap first and skip the run when nothing is new
+            state_file: JSON file where quick check keeps feed validators and known links
+            store_path: SQLite file of previously extracted articles (None disables the store)
+            recheck_after_days: How long a stored article is trusted before it is revalidated
+                with a conditional GET
+            http_cache_dir: Folder of the on-disk HTTP response cache (None disables it)
+            http_cache_max_mb: Size cap of the compressed cache before LRU eviction
+            replay_from_cache: Re-extract every cached article page without touching the
+                network (for tuning the extraction)
+            head_only_fetch: Stream article pages and stop downloading once the head
+                metadata has title, date and description (http backend only)
+            sheet_sync: How the Google Sheet is written - 'diff' (insert new rows and rewrite
+                only changed cells) or 'full' (clear and rewrite every row)
+            output_sinks: Local outputs fed each record as it is extracted, e.g.
+                'ndjson,csv=out.csv,sqlite,parquet,json' (see sinks.SINK_TYPES)
+            sources: Names of the registered sources to crawl (see sources.SOURCES),
+                as a list or comma-separated string; defaults to the Opsera press releases
+            sources_file: Optional JSON file registering extra sources (partner or
+                competitor newsrooms, see sources.load_sources_file)
+            host_concurrency: Requests in flight to one host at a time (defaults to concurrency)
+            max_retries: Retries for timeouts, connection errors, 429 and 5xx responses, with
+                jittered exponential backoff (Retry-After is honoured)
+            browser_pool: Optional long-lived browser.BrowserPool to lease Chrome from; without
+                one, each scrape starts its own pool and closes it at the end
+            browser_pool_size: Warm Chrome sessions kept by the scraper's own pool
+            browser_max_uses: Leases a Chrome session serves before it is recycled
+            rendering_profile: How much of each page Chrome loads - 'light' (eager page load,
+                no images, media, fonts, stylesheets or third-party hosts) or 'full'
+                (see browser.RENDERING_PROFILES)
+            events: Optional events.EventBus receiving structured progress events
+                (scrape_started, page_scanned, link_discovered, article_extracted,
+                sink_written, scrape_finished, scrape_failed)
         """
         self.google_creds_file = google_creds_file
         self.sheet_name = sheet_name
+        self.fetch_backend = fetch_backend
+        self.concurrency = max(1, concurrency)
+        self.rate_limit = rate_limit
+        self.host_concurrency = host_concurrency
+        self.max_retries = max_retries
+        self.browser_pool = browser_pool
+        self.browser_pool_size = browser_pool_size
+        self.browser_max_uses = browser_max_uses
+        self.rendering_profile = get_rendering_profile(rendering_profile)
+        self.events = events
+        self.wait_timeouts = wait_timeouts
+        self.wait_timings = []
+        self.discovery = discovery
+        self.quick_check = quick_check
+        self.state_file = state_file
+        self.store_path = store_path
+        self.recheck_after_days = recheck_after_days
+        self.store = None
+        self.http_cache_dir = http_cache_dir
+        self.http_cache_max_mb = http_cache_max_mb
+        self.replay_from_cache = replay_from_cache
+        self.head_only_fetch = head_only_fetch
+        self.sheet_sync = sheet_sync
+        self.output_sinks = output_sinks
+        self.sinks = None
+        if sources_file:
+            load_sources_file(sources_file)
+        self.sources = resolve_sources(sources or DEFAULT_SOURCES)
+        self.extractor = PressReleaseExtractor()
+        self.article_stats = {}
+        self._stats_lock = threading.Lock()
         self.base_url = "https://www.opsera.ai/newsroom"
         self.press_releases = []
         self.seen_links = set()
+        self.listing_cards = {}  # href -> title/date read from the browser listing
 
     def setup_driver(self):
-        """Set up Selenium WebDriver with Chrome"""
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
-
-        driver_path = ChromeDriverManager().install()
-
-        # Fix for Mac ARM: find correct chromedriver binary
-        if 'THIRD_PARTY' in driver_path or 'LICENSE' in driver_path or not driver_path.endswith('chromedriver'):
-            driver_dir = os.path.dirname(driver_path)
-            for root, dirs, files in os.walk(os.path.dirname(driver_dir)):
-                if 'chromedriver' in files:
-                    potential = os.path.join(root, 'chromedriver')
-                    if 'LICENSE' not in potential and 'NOTICE' not in potential:
-                        driver_path = potential
-                        break
-
-        # Ensure executable
-        if os.path.isfile(driver_path):
-            os.chmod(driver_path, os.stat(driver_path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
-
-        print(f"Using ChromeDriver at: {driver_path}")
-        service = Service(driver_path)
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        return driver
+        """Start a standalone headless Chrome (scrapes lease theirs from the browser pool instead)"""
+        return launch_chrome(self.rendering_profile)
 
     def scrape_press_releases(self):
         """Scrape all press releases from the website"""
-        print(f"Starting scrape of {self.base_url}...")
-        driver = self.setup_driver()
+        if self.replay_from_cache:
+            return self.replay_cached_articles()
+
+        print(f"Starting scrape of {', '.join(source.name for source in self.sources)}...")
+        self._publish('scrape_started', sources=[source.name for source in self.sources])
+        cache = self._open_http_cache()
+        http_fetcher = create_fetcher('http', concurrency=self.concurrency, rate_limit=self.rate_limit, cache=cache,
+                                      host_concurrency=self.host_concurrency, max_retries=self.max_retries,
+                                      stream_parser_factory=HeadMetadataParser if self.head_only_fetch else None)
+        # A pool handed in by a long-lived owner stays warm; otherwise this scrape gets its own
+        browser_pool = self.browser_pool or BrowserPool(self.browser_pool_size, self.browser_max_uses,
+                                                        profile=self.rendering_profile)
+        browser_session = None
+        browser_broken = False
+        driver = None
+        waiter = None
+        self._open_sinks()
 
         try:
-            # Step 1: Get list of all press release links from newsroom (with pagination)
-            # Use the Press Release filter - NOTE: uses hash (#) not query param (?)
-            filter_url = f"{self.base_url}/#type=press-release"
-            driver.get(filter_url)
-            print("Waiting for page to load...")
-            time.sleep(5)
-
-            newsroom_links = []
-
-            # Handle pagination - 35 press releases = 4 pages (9+9+9+8)
-            # Need to click pagination buttons to navigate
-            max_pages = 5  # Safety limit
-            for page_num in range(1, max_pages + 1):
-                print(f"  Scanning page {page_num}...")
-
-                if page_num > 1:
-                    # Click on the page number link to navigate
-                    try:
-                        # Find and click the pagination link for this page
-                        page_link = driver.find_element(By.CSS_SELECTOR, f"a[href='#page={page_num}']")
-                        driver.execute_script("arguments[0].click();", page_link)
-                        time.sleep(3)
-                    except Exception as e:
-                        print(f"    Could not find page {page_num} link, trying JS navigation...")
-                        # Fallback: try updating hash directly and triggering hashchange
-                        driver.execute_script(f"""
-                            window.location.hash = 'type=press-release&page={page_num}';
-                            window.dispatchEvent(new HashChangeEvent('hashchange'));
-                        """)
-                        time.sleep(3)
-
-                # Scroll to ensure content loads
-                driver.execute_script("window.scrollTo(0, 800);")
-                time.sleep(2)
-
-                # Extract links from current page
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-                # Get all newsroom article links, deduplicated
-                page_links = set()
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    # Filter for newsroom article links
-                    if '/newsroom/' not in href:
-                        continue
-                    # Normalize URL
-                    if not href.startswith('http'):
-                        href = 'https://www.opsera.ai' + href
-                    # Skip the main newsroom page
-                    if href.rstrip('/') in ['https://opsera.ai/newsroom', 'https://www.opsera.ai/newsroom']:
-                        continue
-                    # Must have a slug (actual article, not just /newsroom/)
-                    parts = href.rstrip('/').split('/')
-                    if len(parts) > 4 and parts[-1]:  # Has slug after /newsroom/
-                        page_links.add(href)
-
-                # Filter out already seen links
-                new_links = [l for l in page_links if l not in self.seen_links]
-
-                # Check if we found any new links
-                if not new_links and page_num > 1:
-                    print(f"    No new links on page {page_num}, stopping pagination")
-                    break
-
-                # Add new links
-                for link in new_links:
-                    self.seen_links.add(link)
-                    newsroom_links.append(link)
-
-                print(f"    Found {len(new_links)} new links (total: {len(newsroom_links)})")
-
-            print(f"Found {len(newsroom_links)} total press release links")
+            # Step 1: Discover article links for every source. REST and feed discovery are
+            # streams that keep paginating while Step 2 already works on the first links
+            streams = []
+            browser_sources = []
+            for source in self.sources:
+                links = None
+                if self.discovery == 'rest' or not source.browser_listing:
+                    links = self._discover_source(source, http_fetcher)
+                if links is not None:
+                    streams.append((source, links))
+                elif source.browser_listing:
+                    browser_sources.append(source)
+
+            # Chrome is only needed when REST discovery is off or failed, or when it fetches articles
+            if browser_sources or self.fetch_backend == 'selenium':
+                browser_session = browser_pool.acquire()
+                driver = browser_session.driver
+                waiter = PageWaiter(driver, step_timeouts=self.wait_timeouts,
+                                    document_state=browser_pool.profile.document_state)
+            if browser_sources:
+                newsroom_links = self._collect_newsroom_links(driver, waiter)
+                print(f"Found {len(newsroom_links)} total press release links")
+                streams.extend((source, newsroom_links) for source in browser_sources[:1])
+
+                # The listing is the only JS-driven page - article pages are server-rendered,
+                # so the browser goes back to the pool before Step 2 unless it is doing the fetching
+                if self.fetch_backend != 'selenium':
+                    browser_pool.release(browser_session)
+                    browser_session = None
+                    driver = None
 
             # Step 2: Visit each press release page to get details
-            for i, link in enumerate(newsroom_links, 1):
-                print(f"  Scraping {i}/{len(newsroom_links)}: {link[:60]}...")
-                try:
-                    driver.get(link)
-                    time.sleep(2)
+            # A single browser can only show one page at a time, so only HTTP fetches run in parallel
+            if self.fetch_backend == 'selenium':
+                fetcher = create_fetcher('selenium', driver, waiter=waiter)
+                workers = 1
+            else:
+                fetcher = http_fetcher
+                workers = self.concurrency
 
-                    page_soup = BeautifulSoup(driver.page_source, 'html.parser')
-                    press_release = self._extract_press_release_details(page_soup, link)
+            if self.store_path:
+                self.store = ArticleStore(self.store_path, recheck_after_days=self.recheck_after_days)
+            self.article_stats = {}
 
-                    if press_release:
-                        self.press_releases.append(press_release)
-                except Exception as e:
-                    print(f"    Error scraping {link}: {e}")
+            # Sources take turns so one slow or rate-limited host does not starve the others,
+            # while all of them share the connection pool, HTTP cache and rate limiter
+            jobs = interleave(zip(itertools.repeat(source), links) for source, links in streams)
+            self._scrape_articles(fetcher, jobs, workers)
 
             print(f"Extracted {len(self.press_releases)} press releases")
+            if self.store:
+                print("  " + ", ".join(f"{count} {outcome}" for outcome, count in sorted(self.article_stats.items())))
 
         except Exception as e:
             print(f"Error during scraping: {e}")
+            self._publish('scrape_failed', error=str(e))
+            # Only a browser error says the session itself is unusable; keep a warm Chrome otherwise
+            browser_broken = isinstance(e, WebDriverException)
             raise
         finally:
-            driver.quit()
-
+            http_fetcher.close()
+            if cache is not None:
+                cache.close()
+            if self.store is not None:
+                self.store.close()
+                self.store = None
+            self._close_sinks()
+            if browser_session is not None:
+                browser_pool.release(browser_session, broken=browser_broken)
+            if browser_pool is not self.browser_pool:
+                browser_pool.close()
+            if waiter is not None:
+                self.wait_timings = waiter.timings
+                waiter.print_summary()
+
+        self._publish('scrape_finished', count=len(self.press_releases), stats=dict(self.article_stats))
         return self.press_releases
 
-    def _extract_press_release_details(self, soup, url):
-        """Extract details from a single press release page"""
-        data = {'link': url}
-
-        # Extract title - try multiple selectors
-        title_selectors = ['h1', 'h2.entry-title', '.entry-title', 'article h1', 'article h2']
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
-            if title_elem:
-                data['title'] = title_elem.get_text(strip=True)
-                break
+    def _publish(self, event, **data):
+        """Send a progress event to the event bus, when there is one"""
+        if self.events is not None:
+            self.events.publish(event, **data)
 
-        if 'title' not in data:
-            # Try to extract from URL
-            slug = url.rstrip('/').split('/')[-1]
-            data['title'] = slug.replace('-', ' ').title()
+    def _announce(self, numbered_jobs):
+        """Pass numbered (source, link) jobs through, publishing each as it is discovered"""
+        for index, (source, link) in numbered_jobs:
+            self._publish('link_discovered', index=index, source=source.name, link=link)
+            yield index, (source, link)
 
-        # Extract date - look for common patterns
-        date_patterns = [
-            r'(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}',
-            r'\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}',
-            r'\d{4}-\d{2}-\d{2}'
-        ]
+    def _scrape_articles(self, fetcher, jobs, workers):
+        """
+        Stream (source, link) jobs through discover -> fetch/extract -> dedupe -> sink
+
+        jobs may be a lazy iterator; it is drained in its own thread through a bounded
+        queue, so every stage runs concurrently and a slow stage holds back the others.
+        """
+        def scrape(numbered_job):
+            index, (source, link) = numbered_job
+            return self._scrape_article(fetcher, link, index, source)
+
+        numbered_jobs = background(self._announce(enumerate(jobs, 1)))
+        if workers > 1:
+            print(f"  Fetching articles with {workers} workers...")
+            # bounded_map yields in discovery order, so output order stays deterministic
+            records = bounded_map(scrape, numbered_jobs, workers)
+        else:
+            records = (scrape(numbered_job) for numbered_job in numbered_jobs)
+
+        for pr in unique((pr for pr in records if pr), key=lambda pr: pr.link):
+            self._emit(pr)
+
+    def _emit(self, press_release):
+        """Keep an extracted record and hand it to the output sinks straight away"""
+        self.press_releases.append(press_release)
+        if self.sinks is not None:
+            self.sinks.write(press_release)
+        self._publish('article_extracted', count=len(self.press_releases), record=press_release.to_dict())
+
+    def _open_sinks(self):
+        """Open the configured output sinks for this run"""
+        self.sinks = create_sinks(self.output_sinks)
+        self.sinks.open()
+
+    def _close_sinks(self):
+        """Flush and close the output sinks"""
+        if self.sinks is not None:
+            for sink in self.sinks.close():
+                self._publish('sink_written', sink=sink.name, path=sink.path, count=sink.count)
+            self.sinks = None
+
+    def _open_http_cache(self):
+        """Open the on-disk HTTP cache, or return None when it is disabled"""
+        if not self.http_cache_dir:
+            return None
+        return HttpCache(self.http_cache_dir, max_bytes=int(self.http_cache_max_mb * 1024 * 1024))
+
+    def replay_cached_articles(self):
+        """Re-run extraction over every cached article page without any network access"""
+        cache = self._open_http_cache()
+        if cache is None:
+            print("Replay needs the HTTP cache - set HTTP_CACHE_DIR")
+            return self.press_releases
+
+        fetcher = create_fetcher('http', cache=cache, offline=True)
+        self._open_sinks()
+        try:
+            origins = self._article_origins()
+            jobs = []
+            for url in cache.urls():
+                source = self._replay_source(url, origins.get(url))
+                if source is not None:
+                    jobs.append((source, url))
+            print(f"Replaying extraction over {len(jobs)} cached article pages...")
+            # No article store here: the point of a replay is to run the extractor again
+            self._scrape_articles(fetcher, jobs, self.concurrency)
+            print(f"Extracted {len(self.press_releases)} press releases from the cache")
+        finally:
+            fetcher.close()
+            cache.close()
+            self._close_sinks()
 
-        page_text = soup.get_text()
-        data['date'] = ''
+        return self.press_releases
 
-        for pattern in date_patterns:
-            match = re.search(pattern, page_text)
-            if match:
-                data['date'] = self._parse_date(match.group())
-                break
+    def _article_origins(self):
+        """Return {link: (source name, category)} recorded by earlier runs, or {} without a store"""
+        if not self.store_path or not os.path.exists(self.store_path):
+            return {}
+        store = ArticleStore(self.store_path)
+        try:
+            return store.origins()
+        finally:
+            store.close()
 
-        # Also check for time element
-        time_elem = soup.find('time')
-        if time_elem:
-            if time_elem.get('datetime'):
-                data['date'] = self._parse_date(time_elem['datetime'])
-            elif not data['date']:
-                data['date'] = self._parse_date(time_elem.get_text(strip=True))
-
-        # Extract description/first paragraph
-        desc_selectors = ['article p', '.entry-content p', 'main p', '.content p']
-        for selector in desc_selectors:
-            desc_elems = soup.select(selector)
-            for desc_elem in desc_elems:
-                text = desc_elem.get_text(strip=True)
-                if len(text) > 50:  # Skip short paragraphs
-                    data['description'] = text[:300] + '...' if len(text) > 300 else text
-                    break
-            if 'description' in data:
+    def _replay_source(self, url, origin):
+        """
+        Pick the selected source a cached page belongs to
+
+        Sources can share a link filter (press releases and in-the-news are both under
+        /newsroom/), so the source recorded by the run that scraped the page wins, then the
+        one with its stored category; the first matching filter is only a last resort.
+        """
+        matching = [source for source in self.sources if source.link_filter(url)]
+        if origin is not None:
+            name, category = origin
+            for source in matching:
+                if source.name == name:
+                    return source
+            for source in matching:
+                if source.category == category:
+                    return source
+        return matching[0] if matching else None
+
+    def _is_article_link(self, href):
+        """Return True for absolute links to a newsroom article (not the newsroom page itself)"""
+        return NEWSROOM_ARTICLE(href)
+
+    def _discover_source(self, source, fetcher):
+        """Return a stream of new article links for a source, or None when its discovery fails"""
+        print(f"Discovering {source.name} links...")
+        links = source.discover_links(fetcher)
+        try:
+            # Pull the first link here so a dead API can still fall back to the browser
+            first = next(links)
+        except StopIteration:
+            print(f"  {source.name}: no links found")
+            return None
+        except Exception as e:
+            fallback = ', falling back to the browser listing' if source.browser_listing else ''
+            print(f"  {source.name} discovery failed ({e}){fallback}")
+            return None
+
+        return unique(itertools.chain([first], links), seen=self.seen_links)
+
+    def _scrape_article(self, fetcher, link, index, source=None):
+        """Fetch and parse one press release page, returning None on failure"""
+        stored = self.store.get(link) if self.store else None
+        if stored and not self.store.needs_recheck(stored):
+            # Known and recently validated - no request needed
+            self.store.touch(link)
+            self._count_article('cached')
+            return record_from_row(stored)
+
+        print(f"  Scraping #{index}: {link[:60]}...")
+        try:
+            if stored:
+                result = fetcher.fetch_conditional(link, stored['etag'], stored['last_modified'])
+            else:
+                result = fetcher.fetch_conditional(link)
+
+            if result.not_modified and stored:
+                self.store.touch(link, checked=True)
+                self._count_article('unchanged')
+                return record_from_row(stored)
+
+            body_hash = content_hash(result.text)
+            if stored and stored['content_hash'] == body_hash:
+                self.store.touch(link, checked=True)
+                self._count_article('unchanged')
+                return record_from_row(stored)
+
+            # extract() reads the raw head first and only builds a tree when it has to
+            extractor = source.extractor if source else self.extractor
+            press_release = extractor.extract(result.text, link, head_fields=result.head_fields)
+            if press_release:
+                self._fill_from_listing(press_release)
+
+            if press_release and self.store:
+                self.store.upsert(press_release, body_hash, result.etag, result.last_modified,
+                                  source=source.name if source else None)
+            self._count_article('changed' if stored else 'new')
+            return press_release
+        except Exception as e:
+            print(f"    Error scraping {link}: {e}")
+            self._count_article('failed')
+            # Retries are exhausted - keep the last good copy rather than dropping the release
+            return record_from_row(stored) if stored else None
+
+    def _fill_from_listing(self, press_release):
+        """Use the listing card's title and date for fields the article page did not give"""
+        card = self.listing_cards.get(press_release.link)
+        if not card:
+            return
+        if not press_release.title:
+            press_release.title = card.get('title') or ''
+        # A parseable card date beats unparseable page text, but never replaces it with nothing
+        if not press_release.date and (to_date(card.get('date')) or not press_release.raw_date):
+            press_release.set_date(card.get('date'))
+
+    def _count_article(self, outcome):
+        """Tally how an article was handled (workers run concurrently)"""
+        with self._stats_lock:
+            self.article_stats[outcome] = self.article_stats.get(outcome, 0) + 1
+
+    def _collect_newsroom_links(self, driver, waiter):
+        """Walk the paginated newsroom listing and return new article links"""
+        # Use the Press Release filter - NOTE: uses hash (#) not query param (?)
+        filter_url = f"{self.base_url}/#type=press-release"
+        driver.get(filter_url)
+        print("Waiting for page to load...")
+        waiter.cards_present('first listing page')
+
+        newsroom_links = []
+
+        # Handle pagination - 35 press releases = 4 pages (9+9+9+8)
+        # Need to click pagination buttons to navigate
+        max_pages = 5  # Safety limit
+        for page_num in range(1, max_pages + 1):
+            print(f"  Scanning page {page_num}...")
+
+            if page_num > 1:
+                previous_cards = waiter.card_hrefs()
+                # Click on the page number link to navigate
+                try:
+                    # Find and click the pagination link for this page
+                    page_link = driver.find_element(By.CSS_SELECTOR, f"a[href='#page={page_num}']")
+                    driver.execute_script("arguments[0].click();", page_link)
+                except Exception as e:
+                    print(f"    Could not find page {page_num} link, trying JS navigation...")
+                    # Fallback: try updating hash directly and triggering hashchange
+                    driver.execute_script(f"""
+                        window.location.hash = 'type=press-release&page={page_num}';
+                        window.dispatchEvent(new HashChangeEvent('hashchange'));
+                    """)
+
+                # The listing re-renders via AJAX - wait for the hash, then for the new cards
+                waiter.hash_applied(page_num)
+                waiter.cards_changed(previous_cards, step=f"page {page_num} cards")
+
+            # Scroll to ensure content loads
+            driver.execute_script("window.scrollTo(0, 800);")
+            waiter.cards_present(f"page {page_num} cards after scroll")
+
+            # Read the cards in the browser - one script call instead of page_source + a full parse
+            page_links = []
+            for card in waiter.listing_cards():
+                href = card['href']
+                if self._is_article_link(href) and href not in page_links:
+                    page_links.append(href)
+                    self.listing_cards[href] = card
+
+            # Filter out already seen links
+            new_links = [l for l in page_links if l not in self.seen_links]
+
+            # Check if we found any new links
+            if not new_links and page_num > 1:
+                print(f"    No new links on page {page_num}, stopping pagination")
                 break
 
-        if 'description' not in data:
-            data['description'] = ''
+            # Add new links
+            for link in new_links:
+                self.seen_links.add(link)
+                newsroom_links.append(link)
+
+            print(f"    Found {len(new_links)} new links (total: {len(newsroom_links)})")
+            self._publish('page_scanned', page=page_num, new_links=len(new_links), total=len(newsroom_links))
 
-        # Extract category/tags
-        data['category'] = 'Press Release'
+        return newsroom_links
 
-        return data
+    def _extract_press_release_details(self, soup, url):
+        """Extract details from a single press release page"""
+        return self.extractor.extract_from_soup(soup, url)
 
     def _parse_date(self, date_string):
         """Parse date string into standardized format"""
-        if not date_string:
-            return ''
-
-        date_string = date_string.strip()
-
-        # Common date formats
-        formats = [
-            '%B %d, %Y',      # January 15, 2025
-            '%B %d %Y',       # January 15 2025
-            '%d %B %Y',       # 15 January 2025
-            '%Y-%m-%d',       # 2025-01-15
-            '%Y-%m-%dT%H:%M:%S',  # ISO format
-            '%Y-%m-%dT%H:%M:%SZ',
-            '%b %d, %Y',      # Jan 15, 2025
-        ]
-
-        for fmt in formats:
-            try:
-                dt = datetime.strptime(date_string, fmt)
-                return dt.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-
-        return date_string
+        return parse_date(date_string)
 
     def connect_to_google_sheet(self):
         """Connect to Google Sheets using service account credentials"""
@@ -298,8 +530,6 @@ class OpseraPressReleaseScraper:
         sheet = self.connect_to_google_sheet()
         worksheet = sheet.get_worksheet(0)
 
-        headers = ['Title', 'Date', 'Link', 'Category', 'Description', 'Scraped On (UTC)', 'Is New']
-
         # Get existing data
         existing_data = worksheet.get_all_values()
         existing_links = set()
@@ -309,111 +539,51 @@ class OpseraPressReleaseScraper:
                 if len(row) > 2:
                     existing_links.add(row[2])
 
-        # Prepare all rows with new flag
-        all_rows = []
-        new_count = 0
+        # Sort the records themselves by date, newest first (undated ones last)
+        releases = sorted(self.press_releases, key=PressRelease.sort_key, reverse=True)
         scrape_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-        for pr in self.press_releases:
-            is_new = pr['link'] not in existing_links
-            if is_new:
-                new_count += 1
-
-            # Parse date for sorting
-            date_str = pr.get('date', '')
-            if date_str:
-                # Extract just the date part (YYYY-MM-DD)
-                date_for_sort = date_str[:10] if len(date_str) >= 10 else date_str
-            else:
-                date_for_sort = '1900-01-01'  # Put items without dates at the end
-
-            row = {
-                'title': pr.get('title', ''),
-                'date': date_str[:10] if date_str else '',  # Clean date format
-                'link': pr.get('link', ''),
-                'category': pr.get('category', ''),
-                'description': pr.get('description', ''),
-                'scraped_on': scrape_time,
-                'is_new': 'NEW' if is_new else '',
-                'date_for_sort': date_for_sort
-            }
-            all_rows.append(row)
-
-        # Sort by date descending (newest first)
-        all_rows.sort(key=lambda x: x['date_for_sort'], reverse=True)
-
-        # Clear sheet and rewrite with sorted data
-        print(f"Writing {len(all_rows)} press releases to sheet (sorted by date, newest first)...")
-        worksheet.clear()
-
-        # Write headers
-        worksheet.append_row(headers)
-
-        # Write all rows
-        rows_to_write = []
-        new_row_indices = []  # Track which rows are new (for highlighting)
-
-        for i, row in enumerate(all_rows):
-            row_data = [
-                row['title'],
-                row['date'],
-                row['link'],
-                row['category'],
-                row['description'],
-                row['scraped_on'],
-                row['is_new']
-            ]
-            rows_to_write.append(row_data)
-            if row['is_new'] == 'NEW':
-                new_row_indices.append(i + 2)  # +2 because row 1 is headers, rows are 1-indexed
-
-        if rows_to_write:
-            worksheet.append_rows(rows_to_write)
-
-        # Format the sheet
-        self._format_sheet(worksheet, new_row_indices)
+        rows_to_write = [sheet_row(pr, scrape_time, pr.link not in existing_links) for pr in releases]
+        # +2 because row 1 is headers, rows are 1-indexed
+        new_row_indices = [i + 2 for i, pr in enumerate(releases) if pr.link not in existing_links]
+        new_count = len(new_row_indices)
+
+        # Incremental sync needs a sheet this scraper wrote before (matching header row)
+        if self.sheet_sync == 'diff' and existing_data and existing_data[0][:len(HEADERS)] == HEADERS:
+            print(f"Syncing {len(releases)} press releases to sheet (only new rows and changed cells)...")
+            result = sync_sheet(sheet, worksheet, rows_to_write, existing_data)
+            print(f"Successfully updated Google Sheet!")
+            print(f"  - Total press releases: {len(releases)}")
+            print(f"  - New entries: {result.inserted}")
+            print(f"  - Updated: {result.updated}, unchanged: {result.unchanged}, "
+                  f"NEW flags cleared: {result.flags_cleared}")
+            print(f"  - Cells written: {result.cells_written} in {result.calls} API call(s)")
+            return result.inserted
+
+        # Values and formatting go out as batchUpdate calls instead of one call per row
+        print(f"Writing {len(releases)} press releases to sheet (sorted by date, newest first)...")
+        calls = write_sheet(sheet, worksheet, rows_to_write, new_row_indices)
 
         print(f"Successfully updated Google Sheet!")
-        print(f"  - Total press releases: {len(all_rows)}")
+        print(f"  - Total press releases: {len(releases)}")
         print(f"  - New entries: {new_count}")
+        print(f"  - Sheet write API calls: {calls}")
 
         return new_count
 
-    def _format_sheet(self, worksheet, new_row_indices=None):
-        """Apply formatting to the worksheet - headers blue, new rows yellow"""
-        try:
-            # Format headers - blue background, white bold text
-            worksheet.format('A1:G1', {
-                'textFormat': {'bold': True, 'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}},
-                'backgroundColor': {'red': 0.23, 'green': 0.08, 'blue': 0.44}  # Opsera purple
-            })
-
-            # Highlight new rows in yellow
-            if new_row_indices:
-                print(f"  Highlighting {len(new_row_indices)} new entries in yellow...")
-                for row_idx in new_row_indices:
-                    try:
-                        worksheet.format(f'A{row_idx}:G{row_idx}', {
-                            'backgroundColor': {'red': 1, 'green': 1, 'blue': 0.6}  # Yellow
-                        })
-                    except Exception as e:
-                        print(f"    Warning: Could not highlight row {row_idx}: {e}")
-
-            # Freeze header row
-            worksheet.freeze(rows=1)
-
-            # Auto-resize columns
-            worksheet.columns_auto_resize(0, 6)
-
-        except Exception as e:
-            print(f"Warning: Could not format sheet: {e}")
-
     def run(self, update_existing=False):
         """Main execution method"""
         print("=" * 60)
         print("Opsera Press Release Scraper")
         print("=" * 60)
 
+        feed_checker = None
+        if self.quick_check:
+            feed_checker, changed = self.check_for_updates()
+            if not changed:
+                print("\nQuick check found no new press releases - skipping full scrape")
+                return
+
+        # Local sinks are written and closed during the scrape, so a sheet outage below cannot lose them
         self.scrape_press_releases()
 
         if self.press_releases:
@@ -422,6 +592,73 @@ class OpseraPressReleaseScraper:
         else:
             print("\nNo press releases found")
 
+        if feed_checker is not None:
+            feed_checker.record_success(pr.link for pr in self.press_releases)
+
+    def check_for_updates(self):
+        """Read the RSS feed/sitemap with conditional GETs and report whether a full scrape is needed"""
+        print("Quick check: looking for new press releases in the feed...")
+        # Sources sharing feeds (e.g. press releases and in-the-news) are checked together
+        groups = {}
+        for source in self.sources:
+            if source.quick_check_feeds:
+                groups.setdefault(tuple(source.quick_check_feeds), []).append(source.link_filter)
+        feed_groups = [(list(feed_urls), lambda link, filters=filters: any(f(link) for f in filters))
+                       for feed_urls, filters in groups.items()]
+        unwatched = [source.name for source in self.sources if not source.quick_check_feeds]
+
+        fetcher = create_fetcher('http')
+        try:
+            feed_checker = FeedChecker(fetcher, state_file=self.state_file, feed_groups=feed_groups)
+            result = feed_checker.check() if feed_groups else None
+        finally:
+            fetcher.close()
+
+        if unwatched:
+            # Nothing can prove these sources unchanged, so they always get a full run
+            print(f"  No quick-check feed for {', '.join(unwatched)} - running the full scrape")
+            return feed_checker, True
+        if result.new_links:
+            print(f"  {len(result.new_links)} new link(s) in {result.source}")
+        else:
+            print(f"  {'Changes possible' if result.changed else 'Nothing new'} ({result.source})")
+        return feed_checker, result.changed
+
+
+def scraper_options_from_env():
+    """Build OpseraPressReleaseScraper keyword arguments from environment variables"""
+    def flag(name):
+        return os.environ.get(name, '').lower() in ('1', 'true', 'yes')
+
+    return {
+        'fetch_backend': os.environ.get('FETCH_BACKEND', 'http'),  # 'http' or 'selenium'
+        'discovery': os.environ.get('DISCOVERY', 'rest'),  # 'rest' or 'browser'
+        'quick_check': flag('QUICK_CHECK'),
+        'state_file': os.environ.get('SCRAPER_STATE_FILE', 'scraper_state.json'),
+        'store_path': os.environ.get('ARTICLE_STORE', 'articles.db') or None,
+        'recheck_after_days': float(os.environ.get('RECHECK_AFTER_DAYS', '30')),
+        'http_cache_dir': os.environ.get('HTTP_CACHE_DIR', '.http_cache') or None,
+        'http_cache_max_mb': float(os.environ.get('HTTP_CACHE_MAX_MB', '200')),
+        'replay_from_cache': flag('REPLAY_FROM_CACHE'),
+        'head_only_fetch': os.environ.get('HEAD_ONLY_FETCH', '1').lower() in ('1', 'true', 'yes'),
+        'sheet_sync': os.environ.get('SHEET_SYNC', 'diff'),  # 'diff' or 'full'
+        'output_sinks': os.environ.get('OUTPUT_SINKS', ''),  # e.g. "ndjson,csv=out.csv"
+        'sources': os.environ.get('SOURCES', '') or None,  # e.g. "opsera-press-releases,opsera-blog"
+        'sources_file': os.environ.get('SOURCES_FILE') or None,
+        'concurrency': int(os.environ.get('SCRAPER_CONCURRENCY', '4')),
+        'rate_limit': float(os.environ.get('SCRAPER_RATE_LIMIT', '2')),  # requests/second per host
+        'host_concurrency': int(os.environ.get('HOST_CONCURRENCY', '0')) or None,
+        'max_retries': int(os.environ.get('MAX_RETRIES', '3')),
+        'browser_pool_size': int(os.environ.get('BROWSER_POOL_SIZE', '1')),
+        'browser_max_uses': int(os.environ.get('BROWSER_MAX_USES', '50')),
+        'rendering_profile': os.environ.get('RENDERING_PROFILE', 'light'),  # 'light' or 'full'
+        # Per-step browser wait timeouts, e.g. "cards=20,pagination=10,document=15"
+        'wait_timeouts': {
+            step: float(seconds)
+            for step, seconds in (item.split('=') for item in os.environ.get('WAIT_TIMEOUTS', '').split(',') if item)
+        },
+    }
+
 
 def main():
     """Main entry point"""
@@ -444,7 +681,7 @@ def main():
         print("Or set GOOGLE_CREDENTIALS environment variable")
         sys.exit(1)
 
-    scraper = OpseraPressReleaseScraper(GOOGLE_CREDS_FILE, SHEET_NAME)
+    scraper = OpseraPressReleaseScraper(GOOGLE_CREDS_FILE, SHEET_NAME, **scraper_options_from_env())
     scraper.run(update_existing=False)
 
 
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Full-text search index for the Opsera Press Release Scraper
+SQLite FTS5 over titles, descriptions and categories, updated one record at a time as articles are extracted
+"""
+
+import re
+import sqlite3
+import threading
+from record import RECORD_FIELDS, PressRelease
+
+
+# docs holds the records; docs_fts is an external-content FTS5 index kept in step by triggers.
+# prefix='2 3' adds prefix indexes so short "term*" queries do not scan the whole vocabulary
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    link TEXT UNIQUE NOT NULL,
+    title TEXT,
+    date TEXT,
+    description TEXT,
+    category TEXT
+);
+CREATE INDEX IF NOT EXISTS docs_date ON docs (date);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    title, description, category,
+    content='docs', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS docs_ai AFTER INSERT ON docs BEGIN
+    INSERT INTO docs_fts (rowid, title, description, category)
+    VALUES (new.id, new.title, new.description, new.category);
+END;
+CREATE TRIGGER IF NOT EXISTS docs_ad AFTER DELETE ON docs BEGIN
+    INSERT INTO docs_fts (docs_fts, rowid, title, description, category)
+    VALUES ('delete', old.id, old.title, old.description, old.category);
+END;
+CREATE TRIGGER IF NOT EXISTS docs_au AFTER UPDATE ON docs BEGIN
+    INSERT INTO docs_fts (docs_fts, rowid, title, description, category)
+    VALUES ('delete', old.id, old.title, old.description, old.category);
+    INSERT INTO docs_fts (rowid, title, description, category)
+    VALUES (new.id, new.title, new.description, new.category);
+END;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS synced (link TEXT PRIMARY KEY);
+'''
+
+# Dates are ISO text; a date the page gave in another form is kept verbatim and counts as undated
+ISO_DATE = "docs.date GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'"
+
+# bm25 column weights: a match in the title counts most, then the description, then the category
+RANK = 'bm25(docs_fts, 10.0, 3.0, 1.0)'
+
+UPSERT = f'''
+INSERT INTO docs ({', '.join(RECORD_FIELDS)}) VALUES ({', '.join('?' for _ in RECORD_FIELDS)})
+ON CONFLICT (link) DO UPDATE SET {', '.join(f"{field} = excluded.{field}" for field in RECORD_FIELDS[1:])}
+WHERE {' OR '.join(f"{field} IS NOT excluded.{field}" for field in RECORD_FIELDS[1:])}
+'''
+
+
+def fts_query(text):
+    """
+    Turn free text into an FTS5 query: every word must match, each as a prefix
+
+    Words are quoted, so FTS5 operators and punctuation typed by a user cannot break the query.
+    Returns None when the text has no searchable words.
+    """
+    words = re.findall(r'\w+', text.lower())
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+class SearchResults:
+    """One page of matches, best first, and how many matched in total"""
+
+    def __init__(self, total, records, scores):
+        self.total = total
+        self.records = records
+        self.scores = scores  # bm25 relevance per record (higher is better), None without a query
+
+
+class SearchIndex:
+    """Ranked prefix search with date-range filters over extracted press releases"""
+
+    def __init__(self, path='search.db'):
+        """
+        Initialize the index, creating its tables when needed
+
+        Args:
+            path: SQLite database file (':memory:' for a throwaway index)
+        """
+        self.path = path
+        # The web app searches from request threads, so one connection is shared behind a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if path != ':memory:':
+                # Readers keep working while a scrape writes to the same file
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript(SCHEMA)
+
+    def add(self, record):
+        """Index one record, replacing the entry for its link (an unchanged record is a no-op)"""
+        with self._lock, self._conn:
+            self._conn.execute(UPSERT, record.values())
+
+    def sync(self, records, version):
+        """
+        Catch the index up with a full snapshot of records and remember its version
+
+        Only new and changed records are rewritten. A link is removed only when the previous
+        synced snapshot had it and this one does not; records added with add() that no
+        snapshot has caught up with yet (a scrape in progress) are left alone.
+        """
+        links = [record.link for record in records]
+        with self._lock, self._conn:
+            self._conn.executemany(UPSERT, (record.values() for record in records))
+            self._conn.execute('CREATE TEMP TABLE IF NOT EXISTS keep (link TEXT PRIMARY KEY)')
+            self._conn.execute('DELETE FROM keep')
+            self._conn.executemany('INSERT OR IGNORE INTO keep VALUES (?)', ((link,) for link in links))
+            self._conn.execute('DELETE FROM docs WHERE link IN (SELECT link FROM synced EXCEPT SELECT link FROM keep)')
+            self._conn.execute('DELETE FROM synced')
+            self._conn.execute('INSERT INTO synced SELECT link FROM keep')
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,))
+
+    def version(self):
+        """Return the version passed to the last sync(), or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return row[0] if row else None
+
+    def search(self, text='', date_from=None, date_to=None, category=None, limit=25, offset=0):
+        """
+        Return SearchResults for free text, newest first when the text is empty
+
+        date_from and date_to are inclusive ISO dates (YYYY-MM-DD); undated records (and ones
+        whose date could not be parsed) are left out whenever either bound is given.
+        """
+        match = fts_query(text or '')
+        conditions, params = [], []
+        if match:
+            conditions.append('docs_fts MATCH ?')
+            params.append(match)
+        if date_from or date_to:
+            conditions.append(ISO_DATE)
+        if date_from:
+            conditions.append('docs.date >= ?')
+            params.append(date_from)
+        if date_to:
+            conditions.append('docs.date <= ?')
+            params.append(date_to)
+        if category:
+            conditions.append('docs.category = ?')
+            params.append(category)
+
+        source = 'docs JOIN docs_fts ON docs_fts.rowid = docs.id' if match else 'docs'
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        score = f'-{RANK}' if match else 'NULL'
+        order = f'{RANK}, docs.date DESC' if match else f'{ISO_DATE} DESC, docs.date DESC, docs.title'
+        columns = ', '.join(f'docs.{field}' for field in RECORD_FIELDS)
+
+        with self._lock:
+            total = self._conn.execute(f'SELECT COUNT(*) FROM {source} {where}', params).fetchone()[0]
+            rows = self._conn.execute(f'SELECT {columns}, {score} FROM {source} {where} '
+                                      f'ORDER BY {order} LIMIT ? OFFSET ?', params + [limit, offset]).fetchall()
+
+        records = [PressRelease.from_dict(dict(zip(RECORD_FIELDS, row[:-1]))) for row in rows]
+        return SearchResults(total, records, [row[-1] for row in rows])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Batched Google Sheets writer for the Opsera Press Release Scraper
+Collects values and formatting into spreadsheets.batchUpdate requests instead of one API call per change
+"""
+
+from datetime import date
+from record import to_date
+
+
+HEADERS = ['Title', 'Date', 'Link', 'Category', 'Description', 'Scraped On (UTC)', 'Is New']
+
+HEADER_FORMAT = {
+    'textFormat': {'bold': True, 'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}},
+    'backgroundColor': {'red': 0.23, 'green': 0.08, 'blue': 0.44},  # Opsera purple
+}
+NEW_ROW_FORMAT = {
+    'backgroundColor': {'red': 1, 'green': 1, 'blue': 0.6},  # Yellow
+}
+
+LINK_COLUMN = HEADERS.index('Link')
+DATE_COLUMN = HEADERS.index('Date')
+SCRAPED_ON_COLUMN = HEADERS.index('Scraped On (UTC)')
+IS_NEW_COLUMN = HEADERS.index('Is New')
+# Columns that describe the article; a difference in any of them makes a row "updated"
+CONTENT_COLUMNS = [index for index in range(len(HEADERS)) if index not in (SCRAPED_ON_COLUMN, IS_NEW_COLUMN)]
+
+
+def contiguous_ranges(row_indices):
+    """Merge 1-based row numbers into (first, last) runs, e.g. [2, 3, 4, 7] -> [(2, 4), (7, 7)]"""
+    ranges = []
+    for row in sorted(set(row_indices)):
+        if ranges and row == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], row)
+        else:
+            ranges.append((row, row))
+    return ranges
+
+
+def _cell(value):
+    """Return CellData for a raw value (strings are written as-is, like append_rows' RAW mode)"""
+    if isinstance(value, bool):
+        return {'userEnteredValue': {'boolValue': value}}
+    if isinstance(value, (int, float)):
+        return {'userEnteredValue': {'numberValue': value}}
+    return {'userEnteredValue': {'stringValue': '' if value is None else str(value)}}
+
+
+def sheet_row(press_release, scraped_on, is_new):
+    """Return the HEADERS-ordered cell values for a PressRelease"""
+    pr = press_release
+    return [pr.title, pr.date_text, pr.link, pr.category, pr.description, scraped_on, 'NEW' if is_new else '']
+
+
+def _sort_key(row):
+    """Date sort key of a sheet row; undated rows sort last"""
+    return to_date(row[DATE_COLUMN]) or date.min
+
+
+class SyncResult:
+    """What an incremental sheet sync changed"""
+
+    def __init__(self):
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.flags_cleared = 0
+        self.cells_written = 0
+        self.calls = 0
+
+
+class SheetBatch:
+    """Accumulate batchUpdate requests for one worksheet and send them together"""
+
+    def __init__(self, spreadsheet, worksheet, columns=len(HEADERS)):
+        """
+        Initialize the batch
+
+        Args:
+            spreadsheet: gspread Spreadsheet owning the worksheet (batchUpdate is a spreadsheet call)
+            worksheet: gspread Worksheet being written
+            columns: Number of columns the rows span
+        """
+        self.spreadsheet = spreadsheet
+        self.worksheet = worksheet
+        self.sheet_id = worksheet.id
+        self.columns = columns
+        self.requests = []
+        self.calls = 0
+
+    def _range(self, first_row, last_row, first_col=0, last_col=None):
+        """GridRange for 1-based inclusive rows and 0-based columns"""
+        return {
+            'sheetId': self.sheet_id,
+            'startRowIndex': first_row - 1,
+            'endRowIndex': last_row,
+            'startColumnIndex': first_col,
+            'endColumnIndex': self.columns if last_col is None else last_col,
+        }
+
+    def clear(self, fields='userEnteredValue,userEnteredFormat.backgroundColor'):
+        """Blank every cell of the worksheet (values and highlight colour by default)"""
+        self.requests.append({'updateCells': {'range': {'sheetId': self.sheet_id}, 'fields': fields}})
+
+    def ensure_rows(self, row_count):
+        """Grow the grid so row_count rows fit (updateCells does not expand a sheet like append does)"""
+        missing = row_count - self.worksheet.row_count
+        if missing > 0:
+            self.requests.append({'appendDimension': {
+                'sheetId': self.sheet_id, 'dimension': 'ROWS', 'length': missing,
+            }})
+
+    def set_rows(self, first_row, rows, first_col=0):
+        """Write a block of rows starting at the 1-based first_row"""
+        if not rows:
+            return
+        self.requests.append({'updateCells': {
+            'start': {'sheetId': self.sheet_id, 'rowIndex': first_row - 1, 'columnIndex': first_col},
+            'rows': [{'values': [_cell(value) for value in row]} for row in rows],
+            'fields': 'userEnteredValue',
+        }})
+
+    def format_rows(self, row_indices, cell_format):
+        """Apply a cell format to whole rows, one request per contiguous run"""
+        fields = ','.join(f'userEnteredFormat.{key}' for key in cell_format)
+        for first, last in contiguous_ranges(row_indices):
+            self.requests.append({'repeatCell': {
+                'range': self._range(first, last),
+                'cell': {'userEnteredFormat': cell_format},
+                'fields': fields,
+            }})
+
+    def reset_format(self, row_indices, keys=('backgroundColor',)):
+        """Return format properties of whole rows to the sheet default"""
+        fields = ','.join(f'userEnteredFormat.{key}' for key in keys)
+        for first, last in contiguous_ranges(row_indices):
+            self.requests.append({'repeatCell': {
+                'range': self._range(first, last),
+                'cell': {'userEnteredFormat': {}},
+                'fields': fields,
+            }})
+
+    def insert_rows(self, row_indices):
+        """
+        Insert blank rows so they end up at the given 1-based positions
+
+        Positions are final positions; runs are inserted in ascending order, which
+        keeps every earlier position valid while later rows shift down.
+        """
+        for first, last in contiguous_ranges(row_indices):
+            # Inherit formatting from the row below so rows inserted under the header are not styled as it
+            self.requests.append({'insertDimension': {
+                'range': {'sheetId': self.sheet_id, 'dimension': 'ROWS',
+                          'startIndex': first - 1, 'endIndex': last},
+                'inheritFromBefore': False,
+            }})
+
+    def format_header(self):
+        """Style row 1 as the header"""
+        self.format_rows([1], HEADER_FORMAT)
+
+    def freeze_header(self):
+        """Keep the header row visible while scrolling"""
+        self.requests.append({'updateSheetProperties': {
+            'properties': {'sheetId': self.sheet_id, 'gridProperties': {'frozenRowCount': 1}},
+            'fields': 'gridProperties.frozenRowCount',
+        }})
+
+    def auto_resize(self):
+        """Fit column widths to their contents"""
+        self.requests.append({'autoResizeDimensions': {'dimensions': {
+            'sheetId': self.sheet_id, 'dimension': 'COLUMNS', 'startIndex': 0, 'endIndex': self.columns,
+        }}})
+
+    def send(self):
+        """Send the queued requests as one batchUpdate (no call when nothing is queued)"""
+        if not self.requests:
+            return None
+        requests, self.requests = self.requests, []
+        self.calls += 1
+        return self.spreadsheet.batch_update({'requests': requests})
+
+
+def write_sheet(spreadsheet, worksheet, rows, new_row_indices=None):
+    """
+    Replace the worksheet contents with HEADERS + rows in at most two API calls
+
+    The data batch (clear, grow, values) is sent first; formatting goes in a second
+    batch so a formatting error never loses the data. Returns the number of calls made.
+    """
+    batch = SheetBatch(spreadsheet, worksheet)
+    batch.clear()
+    batch.ensure_rows(len(rows) + 1)
+    batch.set_rows(1, [HEADERS] + rows)
+    batch.send()
+
+    try:
+        batch.format_header()
+        if new_row_indices:
+            runs = contiguous_ranges(new_row_indices)
+            print(f"  Highlighting {len(new_row_indices)} new entries in yellow ({len(runs)} range(s))...")
+            batch.format_rows(new_row_indices, NEW_ROW_FORMAT)
+        batch.freeze_header()
+        batch.auto_resize()
+        batch.send()
+    except Exception as e:
+        print(f"Warning: Could not format sheet: {e}")
+
+    return batch.calls
+
+
+def sync_sheet(spreadsheet, worksheet, rows, existing_values):
+    """
+    Bring an existing sheet in line with rows by writing only what differs
+
+    Rows are keyed on the Link column. Known rows keep their position and Scraped On
+    time unless their content changed, only changed cells are written, and stale NEW
+    flags are cleared. Unknown links are inserted at their date-sorted position. The
+    sheet is never cleared, so readers never see it empty. Returns a SyncResult.
+    """
+    width = len(HEADERS)
+    existing = [(list(row) + [''] * width)[:width] for row in existing_values[1:]]
+    positions = {}
+    for index, row in enumerate(existing):
+        link = row[LINK_COLUMN]
+        if link and link not in positions:
+            positions[link] = index
+
+    scraped = {}
+    for row in rows:
+        scraped.setdefault(row[LINK_COLUMN], row)
+
+    result = SyncResult()
+
+    # Desired values for every existing row (in place, before any insert)
+    desired_existing = []
+    for index, current in enumerate(existing):
+        desired = list(current)
+        desired[IS_NEW_COLUMN] = ''
+        row = scraped.get(current[LINK_COLUMN]) if positions.get(current[LINK_COLUMN]) == index else None
+        if row is not None:
+            if any(current[column] != row[column] for column in CONTENT_COLUMNS):
+                desired = list(row)
+                desired[IS_NEW_COLUMN] = ''
+                result.updated += 1
+            else:
+                result.unchanged += 1
+        desired_existing.append(desired)
+
+    new_rows = sorted((row[:IS_NEW_COLUMN] + ['NEW'] + row[IS_NEW_COLUMN + 1:]
+                       for link, row in scraped.items() if link not in positions),
+                      key=_sort_key, reverse=True)
+    result.inserted = len(new_rows)
+
+    # Merge new rows in front of the first existing row with an older date
+    final = []  # (existing index or None, values)
+    cursor = 0
+    for row in new_rows:
+        while cursor < len(existing) and _sort_key(existing[cursor]) >= _sort_key(row):
+            final.append((cursor, desired_existing[cursor]))
+            cursor += 1
+        final.append((None, row))
+    final.extend((index, desired_existing[index]) for index in range(cursor, len(existing)))
+
+    batch = SheetBatch(spreadsheet, worksheet)
+    new_positions = [position + 2 for position, (index, _) in enumerate(final) if index is None]
+    batch.insert_rows(new_positions)
+
+    for first, last in contiguous_ranges(new_positions):
+        block = [final[sheet_row - 2][1] for sheet_row in range(first, last + 1)]
+        batch.set_rows(first, block)
+        result.cells_written += len(block) * width
+
+    flagged_rows = []
+    for position, (index, desired) in enumerate(final):
+        if index is None:
+            continue
+        current = existing[index]
+        if current[IS_NEW_COLUMN]:
+            flagged_rows.append(position + 2)
+        changed = [column for column in range(width) if desired[column] != current[column]]
+        # One write per run of adjacent changed cells
+        for first, last in contiguous_ranges(column + 1 for column in changed):
+            batch.set_rows(position + 2, [desired[first - 1:last]], first_col=first - 1)
+            result.cells_written += last - first + 1
+    result.flags_cleared = len(flagged_rows)
+
+    batch.send()
+
+    try:
+        batch.reset_format(flagged_rows)
+        if new_positions:
+            print(f"  Highlighting {len(new_positions)} new entries in yellow...")
+            batch.format_rows(new_positions, NEW_ROW_FORMAT)
+        if new_positions or result.updated:
+            batch.auto_resize()
+        batch.send()
+    except Exception as e:
+        print(f"Warning: Could not format sheet: {e}")
+
+    result.calls = batch.calls
+    return result
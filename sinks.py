@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Output sinks for the Opsera Press Release Scraper
+Each sink receives press release records one at a time, as soon as they are extracted
+"""
+
+import csv
+import json
+import sqlite3
+from datalog import DataLog
+from record import RECORD_FIELDS
+from search import SearchIndex
+
+
+class Sink:
+    """Destination for extracted records: open(), then write() per record, then close()"""
+
+    name = 'sink'
+    default_path = None
+    options = ()  # boolean constructor flags a spec can switch on with '+flag', e.g. 'ndjson+append'
+
+    def __init__(self, path=None):
+        """
+        Initialize the sink
+
+        Args:
+            path: Output file (defaults to the sink's default_path)
+        """
+        self.path = path or self.default_path
+        self.count = 0
+
+    def open(self):
+        """Prepare the destination before the first record"""
+
+    def write(self, record):
+        """Persist one record"""
+        raise NotImplementedError
+
+    def close(self):
+        """Flush and release the destination"""
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+class NdjsonSink(Sink):
+    """One JSON object per line, flushed per record so the file can be tailed while the scrape runs"""
+
+    name = 'ndjson'
+    default_path = 'scraped_data.ndjson'
+    options = ('append',)
+
+    def __init__(self, path=None, append=False):
+        """
+        Initialize the sink
+
+        Args:
+            path: Output file
+            append: Add to an existing file instead of starting a new one
+        """
+        super().__init__(path)
+        self.append = append
+        self._file = None
+
+    def open(self):
+        self._file = open(self.path, 'a' if self.append else 'w', encoding='utf-8')
+
+    def write(self, record):
+        self._file.write(json.dumps(record.to_dict(), ensure_ascii=False) + '\n')
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class CsvSink(Sink):
+    """Spreadsheet-friendly CSV with a header row"""
+
+    name = 'csv'
+    default_path = 'scraped_data.csv'
+
+    def __init__(self, path=None):
+        super().__init__(path)
+        self._file = None
+        self._writer = None
+
+    def open(self):
+        self._file = open(self.path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(RECORD_FIELDS)
+
+    def write(self, record):
+        self._writer.writerow(record.values())
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SqliteSink(Sink):
+    """SQLite table keyed on link; each record is committed as it arrives"""
+
+    name = 'sqlite'
+    default_path = 'scraped_data.db'
+
+    def __init__(self, path=None, table='press_releases'):
+        """
+        Initialize the sink
+
+        Args:
+            path: SQLite database file
+            table: Table the records are upserted into
+        """
+        super().__init__(path)
+        self.table = table
+        self._conn = None
+
+    def open(self):
+        self._conn = sqlite3.connect(self.path)
+        columns = ', '.join(f"{field} TEXT" + (' PRIMARY KEY' if field == 'link' else '') for field in RECORD_FIELDS)
+        with self._conn:
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table} ({columns})")
+
+    def write(self, record):
+        placeholders = ', '.join('?' for _ in RECORD_FIELDS)
+        with self._conn:
+            self._conn.execute(f"INSERT OR REPLACE INTO {self.table} ({', '.join(RECORD_FIELDS)}) "
+                               f"VALUES ({placeholders})", record.values())
+        self.count += 1
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class ParquetSink(Sink):
+    """Compressed columnar export; records are buffered into row groups (needs pyarrow)"""
+
+    name = 'parquet'
+    default_path = 'scraped_data.parquet'
+
+    def __init__(self, path=None, row_group_size=256):
+        """
+        Initialize the sink
+
+        Args:
+            path: Output file
+            row_group_size: Records buffered before a row group is written
+        """
+        super().__init__(path)
+        self.row_group_size = row_group_size
+        self._buffer = []
+        self._writer = None
+
+    def open(self):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("the parquet sink needs pyarrow (pip install pyarrow)")
+        self._pa = pyarrow
+        self._schema = pyarrow.schema([(field, pyarrow.string()) for field in RECORD_FIELDS])
+        self._writer = pyarrow.parquet.ParquetWriter(self.path, self._schema, compression='zstd')
+
+    def write(self, record):
+        self._buffer.append(record)
+        self.count += 1
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        columns = zip(*(record.values() for record in self._buffer))
+        table = self._pa.table(dict(zip(RECORD_FIELDS, map(list, columns))), schema=self._schema)
+        self._writer.write_table(table)
+        self._buffer = []
+
+    def close(self):
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+
+
+class JsonSink(Sink):
+    """
+    Single JSON array (the scraped_data.json format), deduplicated by link across runs
+
+    Records are appended to a log as they arrive and compacted into atomically replaced
+    snapshots (see datalog.DataLog), so readers never see a half-written file and an
+    interrupted run keeps what it extracted.
+    """
+
+    name = 'json'
+    default_path = 'scraped_data.json'
+
+    def __init__(self, path=None):
+        super().__init__(path)
+        self._log = DataLog(self.path)
+
+    def open(self):
+        self._log.open()
+
+    def write(self, record):
+        self._log.append(record)
+        self.count += 1
+
+    def close(self):
+        self._log.close()
+
+
+class SearchSink(Sink):
+    """Full-text search index (search.SearchIndex) that is searchable while the scrape is still running"""
+
+    name = 'search'
+    default_path = 'search.db'
+
+    def __init__(self, path=None):
+        super().__init__(path)
+        self._index = None
+
+    def open(self):
+        self._index = SearchIndex(self.path)
+
+    def write(self, record):
+        self._index.add(record)
+        self.count += 1
+
+    def close(self):
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+
+SINK_TYPES = {sink.name: sink for sink in [NdjsonSink, CsvSink, SqliteSink, ParquetSink, JsonSink, SearchSink]}
+
+
+class SinkSet:
+    """Fan records out to several sinks; a failing sink is reported and dropped, the others keep going"""
+
+    def __init__(self, sinks):
+        self.sinks = list(sinks)
+
+    def _call(self, sink, method, *args):
+        try:
+            getattr(sink, method)(*args)
+            return True
+        except Exception as e:
+            print(f"Warning: {sink.name} sink ({sink.path}) failed to {method}: {e}")
+            return False
+
+    def open(self):
+        self.sinks = [sink for sink in self.sinks if self._call(sink, 'open')]
+
+    def write(self, record):
+        failed = [sink for sink in self.sinks if not self._call(sink, 'write', record)]
+        for sink in failed:
+            self._call(sink, 'close')
+            self.sinks.remove(sink)
+
+    def close(self):
+        """Close every sink and return the ones that closed cleanly"""
+        closed = []
+        for sink in self.sinks:
+            if self._call(sink, 'close'):
+                print(f"  Wrote {sink.count} records to {sink.path}")
+                closed.append(sink)
+        self.sinks = []
+        return closed
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+def parse_sink_spec(spec):
+    """
+    Split 'ndjson,csv=out.csv' (or a list of such items) into (name, path or None) pairs
+
+    A name keeps any '+flag' options ('ndjson+append=out.ndjson' gives ('ndjson+append',
+    'out.ndjson')); create_sinks() resolves them.
+    """
+    items = spec.split(',') if isinstance(spec, str) else list(spec or [])
+    pairs = []
+    for item in items:
+        name, _, path = item.strip().partition('=')
+        if name:
+            pairs.append((name.strip().lower(), path.strip() or None))
+    return pairs
+
+
+def create_sinks(spec):
+    """Build a SinkSet from a spec like 'ndjson,csv=out.csv,sqlite,parquet'"""
+    sinks = []
+    for spec_name, path in parse_sink_spec(spec):
+        name, *flags = [part.strip() for part in spec_name.split('+')]
+        if name not in SINK_TYPES:
+            print(f"Warning: unknown output sink '{name}' (choose from {', '.join(SINK_TYPES)})")
+            continue
+        sink_type = SINK_TYPES[name]
+        unknown = [flag for flag in flags if flag not in sink_type.options]
+        if unknown:
+            print(f"Warning: ignoring option(s) {', '.join(unknown)} for output sink '{name}'")
+        sinks.append(sink_type(path, **{flag: True for flag in flags if flag in sink_type.options}))
+    return SinkSet(sinks)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Source registry for the Opsera Press Release Scraper
+Each source declares how its articles are discovered, which links belong to it and how they are extracted
+"""
+
+import json
+from urllib.parse import urlsplit
+from discovery import DEFAULT_FEED_URLS, WordPressRestDiscovery, links_from_feed
+from extractor import PressReleaseExtractor
+
+
+class Source:
+    """One crawlable section of a site"""
+
+    def __init__(self, name, discover, link_filter, category='Press Release', extractor=None,
+                 browser_listing=False, quick_check_feeds=None):
+        """
+        Initialize the source
+
+        Args:
+            name: Registry key, used to pick sources with SOURCES
+            discover: Callable taking a fetcher.HttpFetcher and returning an iterator of links
+            link_filter: Predicate selecting this source's article links
+            category: Category recorded on every article of the source
+            extractor: Object with extract(html, url) returning a PressRelease
+                (defaults to a PressReleaseExtractor for the category)
+            browser_listing: Walk the newsroom listing in Chrome when discover fails
+            quick_check_feeds: RSS feeds or sitemaps, tried in order, that QUICK_CHECK reads
+                to tell whether the source has anything new (without any, a quick check
+                always runs the full scrape)
+        """
+        self.name = name
+        self.discover = discover
+        self.link_filter = link_filter
+        self.category = category
+        self.extractor = extractor or PressReleaseExtractor(category=category)
+        self.browser_listing = browser_listing
+        self.quick_check_feeds = list(quick_check_feeds or [])
+
+    def discover_links(self, fetcher):
+        """Return the lazy stream of this source's article links"""
+        return (link for link in self.discover(fetcher) if self.link_filter(link))
+
+
+def section_filter(path):
+    """Predicate for article links below a site section, e.g. '/newsroom/' (not the section page itself)"""
+    def is_article(link):
+        parts = urlsplit(link)
+        if not parts.netloc or parts.query or '/wp-json/' in parts.path:
+            return False
+        start = parts.path.find(path)
+        return start >= 0 and bool(parts.path[start + len(path):].strip('/'))
+    return is_article
+
+
+def wordpress_discovery(site_url, listing_url=None, post_type='posts', taxonomy=None, term=None):
+    """Discovery strategy walking a WordPress REST post type, optionally filtered to one taxonomy term"""
+    def discover(fetcher):
+        return WordPressRestDiscovery(fetcher, site_url=site_url, listing_url=listing_url or site_url,
+                                      post_type=post_type, taxonomy=taxonomy, term=term).iter_links()
+    return discover
+
+
+def feed_discovery(feed_urls):
+    """Discovery strategy reading links from RSS feeds or XML sitemaps"""
+    def discover(fetcher):
+        for url in feed_urls:
+            response = fetcher.request('GET', url)
+            response.raise_for_status()
+            yield from links_from_feed(response.content)
+    return discover
+
+
+# Newsroom article pages (any type), also used to filter the browser listing
+NEWSROOM_ARTICLE = section_filter('/newsroom/')
+
+SOURCES = {}
+
+
+def register(source):
+    """Add a source to the registry (replacing one with the same name)"""
+    SOURCES[source.name] = source
+    return source
+
+
+register(Source(
+    'opsera-press-releases',
+    wordpress_discovery('https://opsera.ai', 'https://opsera.ai/newsroom/', 'press', 'press-type', 'press-release'),
+    NEWSROOM_ARTICLE,
+    category='Press Release',
+    browser_listing=True,
+    quick_check_feeds=DEFAULT_FEED_URLS,
+))
+register(Source(
+    'opsera-in-the-news',
+    wordpress_discovery('https://opsera.ai', 'https://opsera.ai/newsroom/', 'press', 'press-type', 'in-the-news'),
+    NEWSROOM_ARTICLE,
+    category='In The News',
+    quick_check_feeds=DEFAULT_FEED_URLS,
+))
+register(Source(
+    'opsera-blog',
+    wordpress_discovery('https://opsera.ai', 'https://opsera.ai/blog/', 'posts'),
+    section_filter('/blog/'),
+    category='Blog',
+    quick_check_feeds=['https://opsera.ai/feed/', 'https://opsera.ai/wp-sitemap-posts-post-1.xml'],
+))
+
+DEFAULT_SOURCES = ['opsera-press-releases']
+
+
+def load_sources_file(path):
+    """
+    Register extra sources from a JSON list, e.g. partner or competitor newsrooms
+
+    Each entry has a name, a section path, an optional category and either
+    {"type": "wordpress", "site_url", "post_type", "taxonomy", "term"} or
+    {"type": "feed", "feed_urls": [...]}, plus optional "quick_check_feeds" (feed sources
+    default to their feed_urls). Returns the names registered.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    names = []
+    for entry in entries:
+        quick_check_feeds = entry.get('quick_check_feeds')
+        if entry.get('type') == 'feed':
+            discover = feed_discovery(entry['feed_urls'])
+            quick_check_feeds = quick_check_feeds or entry['feed_urls']
+        else:
+            discover = wordpress_discovery(entry['site_url'], entry.get('listing_url'), entry.get('post_type', 'posts'),
+                                           entry.get('taxonomy'), entry.get('term'))
+        register(Source(entry['name'], discover, section_filter(entry.get('path', '/')),
+                        category=entry.get('category', 'Press Release'), quick_check_feeds=quick_check_feeds))
+        names.append(entry['name'])
+    return names
+
+
+def resolve_sources(names):
+    """Return the registered sources for a list or comma-separated string of names"""
+    if isinstance(names, str):
+        names = [name.strip() for name in names.split(',') if name.strip()]
+    unknown = [name for name in names if name not in SOURCES]
+    if unknown:
+        raise ValueError(f"unknown source(s) {', '.join(unknown)} (choose from {', '.join(SOURCES)})")
+    return [SOURCES[name] for name in names]
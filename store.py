@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Persistent article store for the Opsera Press Release Scraper
+Keeps extracted press releases in SQLite so later runs only fetch new or changed pages
+"""
+
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from record import RECORD_FIELDS, PressRelease
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS articles (
+    link TEXT PRIMARY KEY,
+    title TEXT,
+    date TEXT,
+    description TEXT,
+    category TEXT,
+    content_hash TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    last_checked TEXT NOT NULL,
+    source TEXT
+)
+'''
+
+
+def utcnow():
+    """Return the current UTC time as a naive datetime"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def content_hash(text):
+    """Return a stable fingerprint of a page body"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ArticleStore:
+    """SQLite-backed record of every article the scraper has extracted"""
+
+    def __init__(self, path='articles.db', recheck_after_days=30):
+        """
+        Initialize the store
+
+        Args:
+            path: SQLite database file (':memory:' for a throwaway store)
+            recheck_after_days: Known articles are revalidated against the site once
+                they have not been checked for this many days
+        """
+        self.path = path
+        self.recheck_after = timedelta(days=recheck_after_days)
+        # Article workers share one connection, so access is serialized with a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(SCHEMA)
+            columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(articles)')}
+            if 'source' not in columns:
+                # Stores written before sources were recorded; replay falls back to the category
+                self._conn.execute('ALTER TABLE articles ADD COLUMN source TEXT')
+
+    def _now(self):
+        return utcnow().strftime('%Y-%m-%d %H:%M:%S')
+
+    def get(self, link):
+        """Return the stored row for a link as a dict, or None"""
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM articles WHERE link = ?', (link,)).fetchone()
+        return dict(row) if row else None
+
+    def needs_recheck(self, row):
+        """Return True when a stored article is due for revalidation"""
+        last_checked = datetime.strptime(row['last_checked'], '%Y-%m-%d %H:%M:%S')
+        return utcnow() - last_checked >= self.recheck_after
+
+    def touch(self, link, checked=False):
+        """Mark a known article as seen in this run (and optionally as revalidated)"""
+        now = self._now()
+        with self._lock, self._conn:
+            if checked:
+                self._conn.execute('UPDATE articles SET last_seen = ?, last_checked = ? WHERE link = ?',
+                                   (now, now, link))
+            else:
+                self._conn.execute('UPDATE articles SET last_seen = ? WHERE link = ?', (now, link))
+
+    def upsert(self, record, body_hash=None, etag=None, last_modified=None, source=None):
+        """Insert or update an extracted PressRelease along with its fetch validators and source name"""
+        now = self._now()
+        values = record.values()
+        with self._lock, self._conn:
+            self._conn.execute('''
+                INSERT INTO articles (link, title, date, description, category,
+                                      content_hash, etag, last_modified, first_seen, last_seen, last_checked,
+                                      source)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(link) DO UPDATE SET
+                    title = excluded.title,
+                    date = excluded.date,
+                    description = excluded.description,
+                    category = excluded.category,
+                    content_hash = excluded.content_hash,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    last_seen = excluded.last_seen,
+                    last_checked = excluded.last_checked,
+                    source = COALESCE(excluded.source, articles.source)
+            ''', values + [body_hash, etag, last_modified, now, now, now, source])
+
+    def links(self):
+        """Return every stored link"""
+        with self._lock:
+            return {row['link'] for row in self._conn.execute('SELECT link FROM articles')}
+
+    def origins(self):
+        """Return {link: (source name or None, category)} for every stored article"""
+        with self._lock:
+            return {row['link']: (row['source'], row['category'])
+                    for row in self._conn.execute('SELECT link, source, category FROM articles')}
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+def record_from_row(row):
+    """Return the PressRelease for a stored row"""
+    return PressRelease.from_dict({field: row[field] for field in RECORD_FIELDS})
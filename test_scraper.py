@@ -4,17 +4,22 @@ Test script for Opsera Press Release Scraper
 Tests the scraping functionality without writing to Google Sheets
 """
 
-import json
-from scraper import OpseraPressReleaseScraper
+from scraper import OpseraPressReleaseScraper, scraper_options_from_env
+from sinks import JsonSink, parse_sink_spec
 
 
 class TestScraper(OpseraPressReleaseScraper):
     """Test version that doesn't require Google credentials"""
 
-    def __init__(self):
-        self.base_url = "https://www.opsera.ai/newsroom"
-        self.press_releases = []
-        self.seen_links = set()
+    def __init__(self, **kwargs):
+        # The dry run always leaves its results in scraped_data.json, next to any other sinks
+        sinks = parse_sink_spec(kwargs.pop('output_sinks', ''))
+        json_paths = [path for name, path in sinks if name == JsonSink.name]
+        if not json_paths:
+            sinks.append((JsonSink.name, None))
+        self.json_output = (json_paths[0] if json_paths else None) or JsonSink.default_path
+        kwargs['output_sinks'] = [f"{name}={path}" if path else name for name, path in sinks]
+        super().__init__(google_creds_file=None, sheet_name=None, **kwargs)
 
     def test_scrape_only(self):
         """Test scraping and display results without Google Sheets"""
@@ -32,18 +37,14 @@ class TestScraper(OpseraPressReleaseScraper):
             print("-" * 60)
 
             for i, pr in enumerate(self.press_releases, 1):
-                print(f"\n{i}. {pr.get('title', 'No title')}")
-                print(f"   Date: {pr.get('date', 'No date')}")
-                print(f"   Link: {pr.get('link', 'No link')}")
-                if pr.get('description'):
-                    desc = pr['description'][:100] + "..." if len(pr.get('description', '')) > 100 else pr.get('description', '')
+                print(f"\n{i}. {pr.title or 'No title'}")
+                print(f"   Date: {pr.date_text or 'No date'}")
+                print(f"   Link: {pr.link}")
+                if pr.description:
+                    desc = pr.description[:100] + "..." if len(pr.description) > 100 else pr.description
                     print(f"   Description: {desc}")
 
-            output_file = 'scraped_data.json'
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(self.press_releases, f, indent=2, ensure_ascii=False)
-
-            print(f"\n✓ Full data saved to: {output_file}")
+            print(f"\n✓ Full data saved to: {self.json_output}")
 
         else:
             print("\n✗ No press releases found!")
@@ -59,7 +60,7 @@ class TestScraper(OpseraPressReleaseScraper):
 
 def main():
     """Run test scraper"""
-    scraper = TestScraper()
+    scraper = TestScraper(**scraper_options_from_env())
     scraper.test_scrape_only()
 
 
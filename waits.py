@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Readiness-based waits for the Selenium paths of the Opsera Press Release Scraper
+Blocks on concrete page conditions instead of fixed sleeps and records how long each wait took
+"""
+
+import time
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+
+# Article links inside the filterable newsroom listing (the mega menu has its own post loops)
+CARD_LINK_SELECTOR = ".knightowl-blocks-post-loop:has(.filter-bar) .post-loop-data .grid-item h2 a[href]"
+
+# Reads every listing card in one round trip: absolute href, card title and <time datetime>,
+# so the listing never has to be serialized as page_source and reparsed in Python
+LISTING_CARDS_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0]), function (link) {
+    var card = link.closest('.grid-item');
+    var time = card && card.querySelector('time[datetime]');
+    return {
+        href: link.href,
+        title: (link.textContent || '').trim(),
+        date: time ? time.getAttribute('datetime') : ''
+    };
+});
+"""
+
+# Default timeout (seconds) per kind of wait
+DEFAULT_STEP_TIMEOUTS = {
+    'cards': 15,
+    'pagination': 10,
+    'document': 15,
+}
+
+
+class PageWaiter:
+    """Wait for listing and article pages to be ready, keeping a latency log"""
+
+    def __init__(self, driver, timeout=15, step_timeouts=None, poll_frequency=0.2, document_state='complete'):
+        """
+        Initialize the waiter
+
+        Args:
+            driver: WebDriver to poll
+            timeout: Fallback timeout in seconds for kinds without their own entry
+            step_timeouts: Optional dict overriding DEFAULT_STEP_TIMEOUTS per kind
+            poll_frequency: Seconds between condition checks
+            document_state: Earliest document.readyState that counts as loaded - 'interactive'
+                (DOM parsed, matching an eager page-load strategy) or 'complete'
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.step_timeouts = dict(DEFAULT_STEP_TIMEOUTS)
+        self.step_timeouts.update(step_timeouts or {})
+        self.poll_frequency = poll_frequency
+        self.ready_states = ('interactive', 'complete') if document_state == 'interactive' else ('complete',)
+        self.timings = []  # (step, seconds waited, condition met)
+
+    def _wait(self, kind, step, condition):
+        """Block until condition holds or the kind's timeout expires"""
+        timeout = self.step_timeouts.get(kind, self.timeout)
+        start = time.monotonic()
+        try:
+            result = WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency).until(condition)
+            met = True
+        except TimeoutException:
+            result = None
+            met = False
+
+        elapsed = time.monotonic() - start
+        self.timings.append((step, elapsed, met))
+        if not met:
+            print(f"    Timed out after {elapsed:.1f}s waiting for {step}")
+        return result
+
+    def listing_cards(self):
+        """Return the listing cards currently in the DOM as dicts with href, title and date"""
+        try:
+            return self.driver.execute_script(LISTING_CARDS_SCRIPT, CARD_LINK_SELECTOR) or []
+        except WebDriverException:
+            return []
+
+    def card_hrefs(self):
+        """Return the hrefs of the listing cards currently in the DOM"""
+        return {card['href'] for card in self.listing_cards()}
+
+    def document_ready(self, step='document ready'):
+        """Wait for the current document to reach the configured readyState"""
+        return self._wait('document', step,
+                          lambda d: d.execute_script("return document.readyState") in self.ready_states)
+
+    def cards_present(self, step='listing cards'):
+        """
+        Wait for at least one listing card link to exist
+
+        This is the listing's readiness signal: with an eager page-load strategy get() returns
+        at DOMContentLoaded and the cards are read as soon as the listing script renders them.
+        """
+        return self._wait('cards', step, EC.presence_of_all_elements_located((By.CSS_SELECTOR, CARD_LINK_SELECTOR)))
+
+    def hash_applied(self, page_num):
+        """Wait for the listing's location hash to point at page_num"""
+        return self._wait('pagination', f"page {page_num} hash",
+                          lambda d: f"page={page_num}" in (d.execute_script("return window.location.hash") or ''))
+
+    def cards_changed(self, previous_hrefs, step='new card set'):
+        """Wait for the listing cards to differ from previous_hrefs"""
+        def changed(driver):
+            current = self.card_hrefs()
+            return current if current and current != previous_hrefs else False
+        return self._wait('cards', step, changed)
+
+    def total_wait(self):
+        """Return the total seconds spent waiting"""
+        return sum(seconds for _, seconds, _ in self.timings)
+
+    def print_summary(self):
+        """Print how long the recorded waits took"""
+        if not self.timings:
+            return
+        timed_out = sum(1 for _, _, met in self.timings if not met)
+        slowest = max(self.timings, key=lambda timing: timing[1])
+        print(f"Waited {self.total_wait():.1f}s across {len(self.timings)} waits "
+              f"({timed_out} timed out, slowest: {slowest[0]} {slowest[1]:.1f}s)")